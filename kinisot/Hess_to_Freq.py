@@ -3,95 +3,445 @@
 # Comments and/or additions are welcome (send e-mail to:
 # robert.paton@colostate.edu
 
-import sys, math
+import os, re
 import numpy as np
 
-def read_hess(file, iso):
+# Importing regardless of relative import
+try:
+    from . import profiling
+except:
+    import profiling
+
+# Bump whenever a change to Structure alters what is parsed from an output file:
+# this invalidates any parsed data stored by a HessianCache
+PARSER_VERSION = 4
+
+@profiling.timed("hash")
+def content_hash(file):
+   # SHA-256 of the file contents, read in blocks so memory use stays bounded
+   import hashlib # only needed for caching, so not imported at startup
+   digest = hashlib.sha256()
+   with open(file, 'rb') as g_output:
+      for block in iter(lambda: g_output.read(1 << 20), b''):
+         digest.update(block)
+         profiling.count("bytes hashed", len(block))
+   return digest.hexdigest()
+
+# The tail of an output is read backwards from EOF in blocks of this many bytes
+TAIL_BLOCK = 1 << 16
+
+# Compressed outputs are decompressed on the fly, by extension (the module is imported when needed)
+COMPRESSION = {'.gz': 'gzip', '.xz': 'lzma', '.bz2': 'bz2'}
+
+def compression(file):
+   # The decompression module of a compressed file, or None
+   return COMPRESSION.get(os.path.splitext(file)[1].lower()) if isinstance(file, str) else None
+
+def uncompressed_name(file):
+   # The filename without a compression extension, e.g. ts.log.gz -> ts.log
+   return os.path.splitext(file)[0] if compression(file) else file
+
+def open_output(file, mode='rb'):
+   # Opens an output file, decompressing it as it is read when it is compressed
+   module = compression(file)
+   if module is None: return open(file, mode)
+   import importlib
+   if 't' in mode: return importlib.import_module(module).open(file, mode, encoding='latin-1')
+   return importlib.import_module(module).open(file, mode)
+
+def stream_tail(file):
+   # The lines of a compressed output that Structure parses: the last mass table that
+   # precedes an archive containing NImag, the rotational constants and the archive
+   # blocks after it. The file is decompressed as a stream, which cannot be read
+   # backwards, and only these lines are kept, so memory does not grow with its length
+   segment, tail, block, size = [], [], None, 0
+   with open_output(file, 'rb') as g_output:
+      for line in g_output:
+         size += len(line)
+         if block is None:
+            if line.find(b'and mass') > -1:
+               if re.match(rb'\s*Atom +1 has atomic number', line): segment = []
+               segment.append(line)
+            elif line.find(b'Rotational constant') > -1: segment.append(line)
+            elif line.lstrip().startswith(b'1\\1\\'): block = []
+         if block is not None:
+            block.append(line)
+            if line.rstrip().endswith(b'@'):
+               segment += block
+               if b"".join(text.strip() for text in block).find(b'NImag') > -1: tail = list(segment)
+               block = None
+   profiling.count("files read"); profiling.count("bytes read", size)
+   return b"".join(tail).decode('latin-1')
+
+# NImag= in an archive, whose lines Gaussian wraps at a fixed width ("\n ") wherever they
+# fall, so also within the token
+ARCHIVE_NIMAG = re.compile(rb'(?:\r?\n )?'.join(re.escape(bytes([char])) for char in b'NImag='))
+
+@profiling.timed("read")
+def read_tail(file):
+   # The end of a Gaussian output, from the last mass table ("Atom 1 has atomic number
+   # ... and mass ...") that precedes the final archive containing NImag, through to EOF.
+   # The file is read backwards in blocks, so however long a multi-step log is, only
+   # this tail is held in memory; the blocks are joined once, in linear time. Compressed
+   # outputs are streamed forwards instead, by stream_tail
+   if compression(file): return stream_tail(file)
+   mass_table, archive = re.compile(rb'Atom +1 has atomic number'), ARCHIVE_NIMAG
+   overlap = 64
+   blocks, nimag_at, start = [], None, None
+   with open(file, 'rb') as g_output:
+      pos = g_output.seek(0, os.SEEK_END)
+      while pos > 0 and start is None:
+         size = min(TAIL_BLOCK, pos)
+         pos -= size
+         g_output.seek(pos)
+         block = g_output.read(size)
+         # search the new block plus the start of the previous one, for markers split across blocks
+         window = block + (blocks[-1][:overlap] if blocks else b'')
+         if nimag_at is None:
+            found = [match.start() for match in archive.finditer(window)]
+            if found: nimag_at = pos + found[-1]
+         if nimag_at is not None:
+            for match in reversed(list(mass_table.finditer(window))):
+               if pos + match.start() < nimag_at:
+                  start = pos + match.start(); break
+         blocks.append(block)
+   tail = b"".join(reversed(blocks))
+   profiling.count("files read"); profiling.count("bytes read", len(tail))
+   if start is not None: tail = tail[start - pos:]
+   return tail.decode('latin-1')
+
+# Formatted checkpoint files are recognized by their extension
+FCHK_EXTENSIONS = ('.fchk', '.fch')
+
+# Bohr to Angstrom, for fchk coordinates; and h/(8 pi^2) in GHz amu Angstrom^2, for rotational constants
+BOHR_TO_ANGSTROM = 0.52917721092
+ROTATIONAL_CONSTANT = 505.379
+
+def is_fchk(file):
+   return isinstance(file, str) and uncompressed_name(file).lower().endswith(FCHK_EXTENSIONS)
+
+# A section header of a formatted checkpoint file: the name in columns 1-40, the type
+# (I, R, C, L or H) in column 44, then "N=" and the length of an array or a scalar value
+FCHK_HEADER = re.compile(rb'^(\S.{39})   ([IRCLH])   (N=)?\s*(\S+)\s*$')
+
+@profiling.timed("read")
+def read_fchk(file, names):
+   """
+   The sections names of a Gaussian formatted checkpoint file as a dict: arrays
+   as NumPy arrays, each block of numbers being converted in a single call, and
+   scalars as int or float. The file is streamed, so other sections (e.g. MO
+   coefficients) are skipped without being kept in memory
+   """
+   sections, wanted, size = {}, set(names), 0
+   with open_output(file, 'rb') as fchk:
+      lines = iter(fchk)
+      for line in lines:
+         size += len(line)
+         header = FCHK_HEADER.match(line)
+         if header is None: continue
+         name, kind, array, value = header.group(1).decode('latin-1').strip(), header.group(2), header.group(3), header.group(4)
+         if not array:
+            if name in wanted: sections[name] = int(value) if kind == b'I' else float(value.replace(b'D', b'E'))
+            continue
+         # the values of an I or R array follow on lines of 6 or 5 numbers; the lines of
+         # other sections never match a header, so they are simply passed over
+         if name not in wanted or kind not in (b'I', b'R'): continue
+         count = int(value)
+         block = [next(lines, b'') for _ in range(-(-count // (6 if kind == b'I' else 5)))]
+         size += sum(len(text) for text in block)
+         values = np.fromstring(b"".join(block).decode('latin-1'), dtype=int if kind == b'I' else float, sep=' ')
+         if len(values) != count: raise ValueError('Error parsing formatted checkpoint ' + file + ': incomplete ' + name + '!')
+         sections[name] = values
+         if wanted.issubset(sections): break
+   profiling.count("files read"); profiling.count("bytes read", size)
+   return sections
+
+def rotational_constants(coordinates, masses):
+   # Rotational constants (GHz) from the principal moments of inertia (amu Angstrom^2),
+   # leaving out a vanishing moment as Gaussian does for a linear molecule
+   centered = coordinates - np.dot(masses, coordinates) / masses.sum()
+   inertia = np.sum(masses * np.sum(centered ** 2, axis=1)) * np.eye(3) - np.dot(centered.T * masses, centered)
+   return [float(ROTATIONAL_CONSTANT / moment) for moment in np.linalg.eigvalsh(inertia) if moment > 1e-4]
+
+class Structure:
+   # Everything Kinisot needs from a Gaussian frequency job: atomic masses, the packed
+   # lower-triangular force constants and Cartesian coordinates from the archive,
+   # rotational constants, level of theory/basis set and the number of atoms. These all sit at the end of the
+   # output, so only the tail from read_tail is parsed. Formatted checkpoint (.fchk)
+   # files are recognized by their extension and read with read_fchk instead. A Structure can be passed
+   # wherever a filename is accepted, so the parsing cost is paid once per file and
+   # not per isotopologue
+
+   # A HessianCache that this Structure was loaded through (None if not cached)
+   cache = None
+
+   # What was parsed, for memoizing eigenvalues across Structures: the file with its
+   # modification time and size, or the content hash (None: only this object)
+   key = None
+
+   # For a block cut out of a larger Structure by truncate_structure: that Structure
+   # and the atoms (numbered from 0) that were kept
+   parent, atoms = None, None
+
+   @profiling.timed("parse")
+   def __init__(self, file):
+      self.file = file
+      stat = os.stat(file)
+      self.key = (os.path.abspath(file), stat.st_mtime_ns, stat.st_size)
+      self.masses, self.rot_constants, self.level = [], None, None
+      if is_fchk(file): return self._read_fchk(file)
+      archive, block = [], None
+
+      tail = read_tail(file)
+      profiling.count("bytes parsed", len(tail))
+      for line in tail.splitlines():
+         line = line.strip()
+         if line.find('and mass') > -1:
+            if line.split()[1] == '1': self.masses = []
+            self.masses.append(float(line.split()[8]))
+         elif line.startswith('Rotational constant'):
+            # a linear molecule has a single rotational constant in the thermochemistry
+            self.rot_constants = []
+            for value in line.split(':')[1].split():
+               try: self.rot_constants.append(float(value))
+               except ValueError: pass
+
+         # archive blocks run from "1\1\" to "@": keep the last one with a Hessian
+         if line.startswith('1\\1\\'): block = []
+         if block is not None:
+            block.append(line)
+            if line.endswith('@'):
+               if "".join(block).find('NImag') > -1: archive = block
+               block = None
+
+      longline = "".join(archive)
+      natoms = len(self.masses)
+      if longline.find('NImag') < 0 or natoms == 0:
+         raise ValueError('Error parsing Gaussian output ' + file + '!')
+
+      fields = longline.split('\\')
+      if len(fields) > 5 and fields[3] == 'Freq': self.level = fields[4] + "/" + fields[5]
+
+      # SCF energy (Hartree) from the archive, used to Boltzmann-weight conformers
+      energy = re.search(r'\\HF=(-?[\d.]+)', longline)
+      self.scf_energy = float(energy.group(1)) if energy else None
+
+      # Cartesian coordinates (Angstrom) in the archive's fourth section, "charge,mult\El,x,y,z\..."
+      self.coordinates = None
+      sections = longline.split('\\\\')
+      if len(sections) > 3:
+         atoms = sections[3].split('\\')[1:]
+         try: coordinates = [[float(x) for x in atom.split(',')[-3:]] for atom in atoms]
+         except ValueError: coordinates = []
+         if len(coordinates) == natoms: self.coordinates = np.array(coordinates)
+
+      self.natoms = natoms
+      self.masses = np.array(self.masses)
+      self.force_constants = np.array(longline.split("NImag")[1].split('\\')[2].split(','), dtype=float)
+      if len(self.force_constants) != 3 * natoms * (3 * natoms + 1) // 2:
+         raise ValueError('Error parsing Gaussian output ' + file + ': incomplete force constants!')
+
+   def _read_fchk(self, file):
+      # The same data from a formatted checkpoint file: the force constants are stored
+      # packed lower-triangular, as in the archive, and coordinates in Bohr. Rotational
+      # constants are not stored, so they are computed from the coordinates
+      sections = read_fchk(file, ["Number of atoms", "Real atomic weights", "Current cartesian coordinates",
+                                  "Cartesian Force Constants", "SCF Energy"])
+      natoms = sections.get("Number of atoms", 0)
+      if natoms == 0 or "Cartesian Force Constants" not in sections or len(sections.get("Real atomic weights", [])) != natoms:
+         raise ValueError('Error parsing formatted checkpoint ' + file + '!')
+      self.natoms, self.masses = natoms, sections["Real atomic weights"]
+      self.force_constants = sections["Cartesian Force Constants"]
+      if len(self.force_constants) != 3 * natoms * (3 * natoms + 1) // 2:
+         raise ValueError('Error parsing formatted checkpoint ' + file + ': incomplete force constants!')
+      self.scf_energy = sections.get("SCF Energy")
+      self.coordinates = None
+      if len(sections.get("Current cartesian coordinates", [])) == 3 * natoms:
+         self.coordinates = sections["Current cartesian coordinates"].reshape(natoms, 3) * BOHR_TO_ANGSTROM
+         self.rot_constants = rotational_constants(self.coordinates, self.masses)
+
+      # the second line gives the job type, method and basis set, e.g. "Freq  RB3LYP  6-31G(d)"
+      with open_output(file, 'rt') as fchk:
+         fchk.readline(); fields = fchk.readline().split()
+      if len(fields) > 2 and fields[0] == 'Freq': self.level = fields[1] + "/" + fields[2]
+
+   @classmethod
+   def from_arrays(cls, file, natoms, masses, force_constants, rot_constants=None, level=None, digest=None, coordinates=None, scf_energy=None):
+      # A Structure built from previously parsed data, without reading the file
+      structure = cls.__new__(cls)
+      structure.file, structure.natoms, structure.level = file, natoms, level
+      structure.masses, structure.force_constants = np.asarray(masses), np.asarray(force_constants)
+      structure.rot_constants, structure.coordinates = rot_constants, coordinates
+      structure.scf_energy = scf_energy
+      if digest is not None: structure._digest, structure.key = digest, ('sha256', digest)
+      return structure
+
+   @property
+   def digest(self):
+      # Content hash of the output file, computed on first use
+      if getattr(self, '_digest', None) is None:
+         if self.parent is None: self._digest = content_hash(self.file)
+         else:
+            import hashlib
+            selection = self.parent.digest + ":" + ",".join(str(atom) for atom in self.atoms)
+            self._digest = hashlib.sha256(selection.encode('utf-8')).hexdigest()
+      return self._digest
+
+def as_structure(file, parsed=None, cache=None):
+   # Returns the parsed Structure for a filename (Structures pass through). An
+   # optional dict of already-parsed files avoids reading the same log twice,
+   # and an optional HessianCache avoids parsing a log seen in an earlier run
+   if isinstance(file, Structure): return file
+   load = Structure if cache is None else cache.load
+   if parsed is None: return load(file)
+   if file not in parsed: parsed[file] = load(file)
+   return parsed[file]
+
+# Isotopic substitution will consider 1H/2H, 12C/13C and 16O/17O. More can be
+# added, but it hasn't been necessary so far... (element, light mass, heavy mass)
+ISOTOPES = [('H', 1.00783, 2.0141), # 1H - 2D
+            ('C', 12.00000, 13.00335), # 12C - 13C
+            ('O', 15.99491, 16.9991)] # 16O - 17O
+
+def isotopologue_masses(file, iso):
+   # Atomic masses with the atoms numbered in iso (comma-separated, counting from 1)
+   # replaced by their heavier isotope. The label '0' leaves every atom unchanged
+   masses = as_structure(file).masses.copy()
+   for atom in iso.split(','):
+      i = int(atom) - 1
+      if i < 0 or i >= len(masses): continue
+      for element, light, heavy in ISOTOPES:
+         if np.isclose(masses[i], light):
+            masses[i] = heavy; break
+   return masses
+
+def substitutable_atoms(file, elements=None):
+   # Atom numbers (counting from 1) that have an isotopic substitution defined,
+   # optionally restricted to a list of element symbols such as ['H', 'C']
+   atoms = []
+   for i, mass in enumerate(as_structure(file).masses):
+      for element, light, heavy in ISOTOPES:
+         if np.isclose(mass, light) and (elements is None or element in elements):
+            atoms.append(i + 1); break
+   return atoms
+
+def expand_packed(packed, weights, out, symmetric=True):
+   # Writes packed lower-triangular values (row by row, the order of the archive) into
+   # the square array out in place, multiplying element (i, j) by weights[i] * weights[j].
+   # With symmetric=False only the lower triangle is written, which is all eigvalsh reads
+   start = 0
+   for i in range(len(weights)):
+      row = out[i, :i + 1]
+      np.multiply(packed[start:start + i + 1], weights[:i + 1], out=row)
+      row *= weights[i]
+      if symmetric: out[:i, i] = row[:i]
+      start += i + 1
+   return out
+
+# Atoms closer than these distances (Angstrom) count as bonded when counting bonds from
+# a labelled atom: pairs involving hydrogen (mass below 3 amu, so also deuterium), and others
+BOND_DISTANCE_H, BOND_DISTANCE = 1.3, 2.0
+
+def cutoff_atoms(file, iso, radius=None, bonds=None):
+   """
+   The atoms (numbered from 0) of a cutoff model around the labelled atoms in iso:
+   those within radius Angstrom of a labelled atom, and/or those at most bonds
+   bonds away from one, using the Cartesian coordinates from the archive
+   """
+   structure = as_structure(file)
+   if structure.coordinates is None:
+      raise ValueError("A cutoff model requires Cartesian coordinates, which were not found in " + str(structure.file) + "!")
+   labelled = [int(atom) - 1 for atom in iso.split(',') if 0 < int(atom) <= structure.natoms]
+   if not labelled: raise ValueError("A cutoff model requires a labelled atom of " + str(structure.file) + "!")
+   coordinates = structure.coordinates
+   distances = np.sqrt(((coordinates[:, np.newaxis, :] - coordinates[np.newaxis, labelled, :]) ** 2).sum(axis=2)).min(axis=1)
+   keep = np.zeros(structure.natoms, dtype=bool)
+   keep[labelled] = True
+   if radius is not None: keep |= distances <= radius
+   if bonds is not None:
+      light = structure.masses < 3.0
+      pairs = np.sqrt(((coordinates[:, np.newaxis, :] - coordinates[np.newaxis, :, :]) ** 2).sum(axis=2))
+      bonded = pairs < np.where(light[:, np.newaxis] | light[np.newaxis, :], BOND_DISTANCE_H, BOND_DISTANCE)
+      np.fill_diagonal(bonded, False)
+      shell = np.zeros(structure.natoms, dtype=bool)
+      shell[labelled] = True
+      reached = shell.copy()
+      for _ in range(bonds):
+         shell = bonded[shell].any(axis=0) & ~reached
+         reached |= shell
+      keep |= reached
+   return np.flatnonzero(keep)
+
+def truncate_structure(file, atoms):
+   """
+   A Structure of the given atoms alone, whose force constants are the block of
+   the full Cartesian Hessian between them (the rest of the system is held fixed).
+   The packed block is taken straight from the packed force constants
+   """
+   structure = as_structure(file)
+   atoms = np.sort(np.asarray(atoms))
+   dofs = (3 * atoms[:, np.newaxis] + np.arange(3)).ravel()
+   rows, columns = np.tril_indices(len(dofs))
+   i, j = dofs[rows], dofs[columns]
+   block = structure.force_constants[i * (i + 1) // 2 + j]
+   coordinates = structure.coordinates[atoms] if structure.coordinates is not None else None
+   truncated = Structure.from_arrays(structure.file, len(atoms), structure.masses[atoms], block, None, structure.level,
+                                     coordinates=coordinates, scf_energy=structure.scf_energy)
+   truncated.parent, truncated.atoms = structure, atoms
+   return truncated
+
+def truncate_isotopologue(file, iso, radius=None, bonds=None):
+   # The cutoff model of a structure around the atoms labelled in iso, with the label
+   # renumbered to match. With the label '0' nothing is substituted, and the structure
+   # is returned whole, as it is when the cutoff model would keep every atom
+   if iso == '0' or (radius is None and bonds is None): return as_structure(file), iso
+   atoms = cutoff_atoms(file, iso, radius, bonds)
+   if len(atoms) == as_structure(file).natoms: return as_structure(file), iso
+   numbers = dict((atom + 1, k + 1) for k, atom in enumerate(atoms))
+   return truncate_structure(file, atoms), ",".join(str(numbers[int(atom)]) for atom in iso.split(',') if int(atom) in numbers)
+
+@profiling.timed("mass-weight")
+def read_hess(file, iso, out=None, factor=1.0, symmetric=True):
    # The force constant matrix is read from g09 ouptut
    # The matrix values are mass-weighted according to the isotopic masses
    # Vibrational scaling factors are not applied to matrix elements at this stage:
    # the resulting frequencies can be scaled after diagonalization
+   # The packed force constants are expanded straight into out (a 3N x 3N work array,
+   # allocated if not given), with any constant factor applied in the same pass
+   structure = as_structure(file)
+   d_o_f = structure.natoms * 3
+   if out is None: out = np.zeros((d_o_f, d_o_f))
+
+   # Weighting factors sqrt(factor/m) for each of the 3N Cartesian coordinates
+   weights = np.repeat(np.sqrt(factor / isotopologue_masses(structure, iso)), 3)
+   expand_packed(structure.force_constants, weights, out, symmetric)
+   profiling.count("matrices built")
 
-   # Read gaussian output
-   g_output = open(file, 'r')
-   inlines = g_output.readlines()
-
-   mass_list = []
-   start_force = None
-   
-   for i in range(0,len(inlines)):
-      if inlines[i].strip().find('and mass') > -1:
-         mass_list.append(float(inlines[i].strip().split()[8]))
-
-      if inlines[i].strip().startswith('NAtoms='):
-         d_o_f = int(inlines[i].strip().split()[1])*3
-
-      if inlines[i].strip().find('NImag') > -1: start_force = i
-
-   if start_force is None:
-      print('Error parsing Gaussian output!'); sys.exit()
-
-# Hessian and mass-weighted Hessian (3N x 3N matrices, N = no. atoms)
-   hess_mat = np.ndarray(shape=(d_o_f,d_o_f))
-   mw_hess_mat = np.ndarray(shape=(d_o_f,d_o_f))
-
-   # Isotopic substitution will consider 1H/2H, 12C/13C and 16O/17O. More can be
-   # added, but it hasn't been necessary so far...
-   isolist = iso.split(',')
-   for i in range(0,len(mass_list)):
-      for atom in isolist:
-         if i == int(atom)-1:
-            if np.isclose(mass_list[i], 1.00783): mass_list[i] = 2.0141 # 1H - 2D
-            if np.isclose(mass_list[i], 12.00000): mass_list[i] = 13.00335 # 12C - 13C
-            if np.isclose(mass_list[i],15.99491): mass_list[i] = 16.9991 # 16O - 17O
-
-   # parse the list of Hessian matrix elements from the end of the Gaussian output
-   longline = ""
-   for i in range(start_force,len(inlines)):
-      longline = longline + inlines[i].rstrip().lstrip()
-   forces = longline.split("NImag")[1].split('\\')[2].split(',')
-   
-   # Mass weight the Hessian
-   n = 0; l = -1
-   for m in range (0, d_o_f):
-      for n in range(0,m+1):
-         l = l + 1
-         Hmn = forces[l]
-         sqrt_Mmn = (mass_list[m//3] * mass_list[n//3]) ** 0.5
-         hess_mat[n,m] = float(Hmn)
-         mw_hess_mat[m,n] = ((float(Hmn) / sqrt_Mmn))
-         mw_hess_mat[n,m] = ((float(Hmn) / sqrt_Mmn))
-
-   return mw_hess_mat
+   return out
 
 def level_of_theory(file):
-   # Read gaussian output for the level of theory and basis set used
-   g_output = open(file, 'r')
-   inlines = g_output.readlines()
-   level = "none"
-
-   for i in range(0,len(inlines)):
-      if inlines[i].strip().find('\\Freq\\') > -1:
-          if len(inlines[i].strip().split("\\")) > 5:
-              level = (inlines[i].strip().split("\\")[4])
-              bs = (inlines[i].strip().split("\\")[5])
-   return level+"/"+bs
+   # The level of theory and basis set used, from the Gaussian archive
+   structure = as_structure(file)
+   if structure.level is None: return "none"
+   return structure.level
 
 def is_linear(file):
    # Check if a molecule is linear or not, from the rotational constants
    # in the Gaussian output: a linear molecule has a zero (or absent) first
    # rotational constant, e.g. "Rotational constants (GHZ): 0.00000 11.69 11.69"
    # This affects the number of rotational d.o.f. (2 rather than 3)
+   if isinstance(file, Structure) or is_fchk(file): constants = as_structure(file).rot_constants
+   else:
+      constants = None
+      profiling.count("files read")
+      with open_output(file, 'rt') as g_output:
+         for line in g_output:
+            if line.find('Rotational constants (GHZ):') > -1:
+               constants = []
+               for value in line.split(':')[1].split():
+                  try: constants.append(float(value))
+                  except ValueError: pass
    symm = 'none'
-   with open(file, 'r') as g_output:
-      for line in g_output:
-         if line.find('Rotational constants (GHZ):') > -1:
-            constants = []
-            for value in line.split(':')[1].split():
-               try: constants.append(float(value))
-               except ValueError: pass
-            if len(constants) < 3 or min(abs(c) for c in constants) < 1e-4:
-               symm = 'linear'
-            else:
-               symm = 'none'
+   if constants is not None:
+      if len(constants) < 3 or min(abs(c) for c in constants) < 1e-4: symm = 'linear'
    return symm
@@ -4,18 +4,20 @@ from __future__ import print_function
 # Comments and/or additions are welcome (send e-mail to:
 # robert.paton@colostate.edu
 
-import pathlib, sys, math, time
+import os, sys, math, time, threading, weakref, warnings
+from collections import OrderedDict
 import numpy as np
-from glob import glob
 from argparse import ArgumentParser
 
 # Importing regardless of relative import
 try:
-    from .vib_scale_factors import scaling_data, scaling_refs
+    from .vib_scale_factors import scaling_index, scaling_refs, normalize_level
     from .Hess_to_Freq import *
+    from . import profiling
 except:
-    from vib_scale_factors import scaling_data, scaling_refs
+    from vib_scale_factors import scaling_index, scaling_refs, normalize_level
     from Hess_to_Freq import *
+    import profiling
 
 # version
 __version__ = "2.0.3"
@@ -27,6 +29,13 @@ SPEED_OF_LIGHT = 2.99792458e10 #cm s-1
 ENERGY_AU = 4.35974434e-18 #J
 BOHR_RADIUS = 5.2917721092e-11 #m
 ATOMIC_MASS_UNIT = 1.660538921e-27 #kg
+AVOGADRO_CONSTANT = 6.0221415e23 #mol-1
+
+# Converts mass-weighted force constants from Hartree/(amu Bohr^2) to cm-2 - a bit ugly
+UNIT_CONVERSION = ENERGY_AU / (BOHR_RADIUS**2 * ATOMIC_MASS_UNIT) / ((SPEED_OF_LIGHT * 2 * np.pi)**2)
+
+# Memory for the stacked work arrays that isotopologue Hessians are expanded into
+EIGEN_BATCH_BYTES = 64 * 1024**2
 
 # print formatting
 space = "   "; dash = "--"; dash_line = space * 17 + " " + dash * 37
@@ -34,14 +43,16 @@ space = "   "; dash = "--"; dash_line = space * 17 + " " + dash * 37
 # Enables output to terminal and to text file
 class Logger:
    # Designated initializer
-   def __init__(self,filein,suffix,append):
+   def __init__(self,filein,suffix,append,quiet=False):
       # Create the log file at the input path
       self.log = open(filein+"_"+append+"."+suffix, 'w' )
+      # A quiet log is written to the file without echoing to the terminal
+      self.quiet = quiet
 
    # Write a message to the log
    def Write(self, message):
       # print the message
-      print(message, end='')
+      if not self.quiet: print(message, end='')
       # Write to log
       self.log.write(message)
 
@@ -70,53 +81,58 @@ def find_scaling_factor(level):
    case and hyphens and stripping Gaussian's R/U/RO spin prefix. Returns
    (factor, reference) or (None, None) if the level is not in the database.
    """
-   def norm(name):
-      return name.upper().replace("-", "")
-   candidates = {norm(level)}
+   candidates = {normalize_level(level)}
    for prefix in ("RO", "R", "U"):
       if level.upper().startswith(prefix):
-         candidates.add(norm(level[len(prefix):]))
-   for scal in scaling_data:
-      if norm(scal['level'].decode("utf-8")) in candidates:
-         return scal['zpe_fac'], scaling_refs[scal['zpe_ref']]
-   return None, None
+         candidates.add(normalize_level(level[len(prefix):]))
+   # the earliest matching row of the table wins, as in a linear scan
+   index = scaling_index()
+   matches = sorted([index[candidate] for candidate in candidates if candidate in index])
+   if not matches: return None, None
+   row, zpe_fac, zpe_ref = matches[0]
+   return zpe_fac, scaling_refs[zpe_ref]
 
-def get_frequency_scaling(files, log):
+def get_frequency_scaling(files, log=None):
    # Check the level of theory matches for all files and then try to find
-   # the relevant vibrational scaling factor
+   # the relevant vibrational scaling factor. Messages go to the log, if given
    freq_scale_factor, level = 1.00, "unknown"
    l_o_t = []
    for file in files:
       l_o_t.append(level_of_theory(file))
    if l_o_t[0] != l_o_t[1]:
-      log.Writeonlyfile("\nWARNING: found different levels of theory for reactant " + l_o_t[0] + " and TS " + l_o_t[1])
+      if log != None: log.Writeonlyfile("\nWARNING: found different levels of theory for reactant " + l_o_t[0] + " and TS " + l_o_t[1])
    else:
       level = l_o_t[0]
       factor, ref = find_scaling_factor(level)
       if factor is not None:
          freq_scale_factor = factor
-         log.Write("\n  " + "Found vibrational scaling factor " + str(freq_scale_factor) + " for " + level + " level of theory")
-         log.Write("\n  REF: " + ref)
+         if log != None:
+            log.Write("\n  " + "Found vibrational scaling factor " + str(freq_scale_factor) + " for " + level + " level of theory")
+            log.Write("\n  REF: " + ref)
 
-   if freq_scale_factor == 1.00:
+   if freq_scale_factor == 1.00 and log != None:
       log.Write("\n  Unable to find vibrational scaling factor for " + level + "; using value of 1.0")
 
    return freq_scale_factor
 
+def vibrational_temperatures(frequency_wn, temperature=None):
+   """
+   Converts (scaled) wavenumbers to hv/k, or to hv/kT when a temperature is
+   given. frequency_wn may be a list or an array whose last axis runs over the
+   modes; an array of temperatures adds its own axes in front of the modes
+   """
+   hv_over_k = PLANCK_CONSTANT * SPEED_OF_LIGHT * np.asarray(frequency_wn, dtype=float) / BOLTZMANN_CONSTANT
+   if temperature is None: return hv_over_k
+   return hv_over_k / np.expand_dims(temperature, -1)
+
 def calc_product_factor(frequency_wn):
    """
    Calculates the product of (scaled) vibrational frequencies in order to
    obtain the Teller-Redlich product factor. There is no temperature dependence
    to this term in the BM equation
    """
-   product = 0.0
-   frequency = [entry * SPEED_OF_LIGHT for entry in frequency_wn]
-
-   for entry in frequency:
-      # changing to vibrational temperatures avoids big numbers. Everything is done logarithmically for the same reason throughout
-      hv_over_k = PLANCK_CONSTANT * entry / BOLTZMANN_CONSTANT
-      product += np.log(hv_over_k)
-   return product
+   # changing to vibrational temperatures avoids big numbers. Everything is done logarithmically for the same reason throughout
+   return np.sum(np.log(vibrational_temperatures(frequency_wn)), axis=-1)
 
 def calc_zpe_factor(frequency_wn, temperature):
    """
@@ -124,53 +140,308 @@ def calc_zpe_factor(frequency_wn, temperature):
    themselves are not temperature dependent although the exponential form of
    this term in the BM equation is.
    """
-   product = 0.0
-   frequency = [entry * SPEED_OF_LIGHT for entry in frequency_wn]
-   for entry in frequency:
-      hv_over_kt = ((PLANCK_CONSTANT*entry)/(BOLTZMANN_CONSTANT * temperature))
-      product += np.log(math.exp(0.5 * hv_over_kt))
-   return product
+   # log(exp(hv/2kT)) taken analytically, which cannot overflow at low temperature
+   return np.sum(0.5 * vibrational_temperatures(frequency_wn, temperature), axis=-1)
 
 def calc_excitation_factor(frequency_wn, temperature):
    """
    Calculates the excitation factor term of the RPFR from the (scaled) vibrational
    frequencies. This term is temperature dependent.
    """
-   product = 0.0
-   frequency = [entry * SPEED_OF_LIGHT for entry in frequency_wn]
-   for entry in frequency:
-      factor = ((PLANCK_CONSTANT*entry)/(BOLTZMANN_CONSTANT*temperature))
-      product += np.log(1-math.exp(-factor))
-   return product
+   # log(1 - exp(-hv/kT)) in its expm1 form, accurate for low frequencies
+   return np.sum(np.log(-np.expm1(-vibrational_temperatures(frequency_wn, temperature))), axis=-1)
+
+def calc_moments_of_inertia(coordinates, masses):
+   """
+   Principal moments of inertia (amu Angstrom^2) about the centre of mass
+   """
+   centred = coordinates - np.dot(masses, coordinates) / np.sum(masses)
+   tensor = np.eye(3) * np.sum(masses * np.sum(centred**2, axis=1)) - np.einsum('i,ij,ik->jk', masses, centred, centred)
+   return np.linalg.eigvalsh(tensor)
+
+def calc_teller_redlich(file, iso):
+   """
+   Log of the product of the vibrational frequency ratios (isotopologue over
+   unsubstituted) over all 3N-6 (3N-5) modes, including an imaginary mode, from
+   the Teller-Redlich product rule. Only the masses and the moments of inertia
+   are needed: there is no Hessian and no diagonalization
+   """
+   structure = as_structure(file)
+   if structure.coordinates is None: raise ValueError("No coordinates found in " + structure.file + "!")
+   masses, iso_masses = structure.masses, isotopologue_masses(structure, iso)
+   moments = calc_moments_of_inertia(structure.coordinates, masses)
+   iso_moments = calc_moments_of_inertia(structure.coordinates, iso_masses)
+   # a linear molecule has one zero moment of inertia and only two rotations
+   rotations = moments > 1e-6 * np.max(moments)
+   return 1.5 * np.sum(np.log(masses / iso_masses)) + 1.5 * np.log(np.sum(iso_masses) / np.sum(masses)) \
+          + 0.5 * np.sum(np.log(iso_moments[rotations] / moments[rotations]))
+
+def calc_log_det_product(file, iso):
+   """
+   Log of the product of the |eigenvalues| of the mass-weighted Hessian over the
+   internal (vibrational) modes, i.e. of the squared vibrational frequencies, from
+   a log-determinant. Translations and rotations are projected out and replaced by
+   unit eigenvalues; a Cholesky factorization is used when the result is positive
+   definite (minima) and an LU factorization otherwise (transition structures)
+   """
+   structure = as_structure(file)
+   if structure.coordinates is None: raise ValueError("No coordinates found in " + structure.file + "!")
+   masses = isotopologue_masses(structure, iso)
+   mw_hessmat = read_hess(structure, iso)
+
+   # mass-weighted translation and rotation vectors, orthonormalized
+   centred = structure.coordinates - np.dot(masses, structure.coordinates) / np.sum(masses)
+   sqrt_mass = np.sqrt(masses)[:, np.newaxis]
+   vectors = []
+   for axis in np.eye(3):
+      vectors.append((sqrt_mass * axis * np.ones_like(centred)).ravel())
+      vectors.append((sqrt_mass * np.cross(axis, centred)).ravel())
+   u, sigma, vt = np.linalg.svd(np.array(vectors).T, full_matrices=False)
+   trans_rot = u[:, sigma > 1e-6 * sigma[0]]
+
+   # P H P + T T' with P = 1 - T T', as the rank-2k update H - T W' - W T' with
+   # W = H T - T (T' H T + 1) / 2, in O(n^2 k) rather than two O(n^3) products
+   hess_trans_rot = np.dot(mw_hessmat, trans_rot)
+   update = hess_trans_rot - 0.5 * np.dot(trans_rot, np.dot(trans_rot.T, hess_trans_rot) + np.eye(trans_rot.shape[1]))
+   internal = mw_hessmat
+   internal -= np.dot(trans_rot, update.T)
+   internal -= np.dot(update, trans_rot.T)
+   try:
+      return 2.0 * np.sum(np.log(np.diag(np.linalg.cholesky(internal))))
+   except np.linalg.LinAlgError:
+      return np.linalg.slogdet(internal)[1]
+
+# The log-det of each unsubstituted Structure, shared by every compute_product_factor call on it
+reference_log_dets = weakref.WeakKeyDictionary()
+
+def compute_product_factor(rct, ts, prd, label, method="teller-redlich"):
+   """
+   The Teller-Redlich product factor without an eigendecomposition. For an EQE
+   this is TRPF itself; for a KIE the imaginary frequency ratio is not available
+   without diagonalizing, and the product V-ratio x TRPF (the combination that
+   enters the Bigeleisen-Mayer KIE) is returned. method is "teller-redlich"
+   (analytic, from masses and moments of inertia) or "log-det" (log-determinant
+   of the projected mass-weighted Hessians)
+   """
+   parsed = {}
+   rct = [as_structure(file, parsed) for file in rct]
+   if ts != None: second = [as_structure(file, parsed) for file in ts]
+   elif prd != None: second = [as_structure(file, parsed) for file in prd]
+   else: raise ValueError("Kinisot requires either a TS for KIE or a product for EQE!")
+
+   def log_ratio(structure, iso):
+      if method == "teller-redlich": return calc_teller_redlich(structure, iso)
+      elif method == "log-det":
+         if structure not in reference_log_dets: reference_log_dets[structure] = calc_log_det_product(structure, '0')
+         return 0.5 * (calc_log_det_product(structure, iso) - reference_log_dets[structure])
+      raise ValueError("Unknown product factor method " + str(method) + "!")
+
+   log_rct = sum([log_ratio(structure, label[i]) for i, structure in enumerate(rct)])
+   log_second = sum([log_ratio(structure, label[len(rct) + i]) for i, structure in enumerate(second)])
+   return np.exp(log_rct - log_second)
+
+def check_product_factor(rct, ts, prd, label, freq_cutoff=50.0, method="teller-redlich", rtol=2e-3):
+   """
+   Compares compute_product_factor with the V-ratio x TRPF of the eigenvalue-based
+   compute_isotope_effect. The two differ slightly because Kinisot does not
+   project translations and rotations out of the Hessian before diagonalizing.
+   Returns (fast value, eigenvalue value, relative deviation, deviation <= rtol)
+   """
+   fast = compute_product_factor(rct, ts, prd, label, method)
+   values = compute_isotope_effect(rct, ts, prd, label, 298.15, 1.0, freq_cutoff)
+   reference = values[7] * values[3]
+   deviation = abs(fast / reference - 1.0)
+   return float(fast), float(reference), float(deviation), bool(deviation <= rtol)
+
+def calc_eigenvalues(mw_hessmat):
+   """
+   Diagonalizes a mass-weighted Hessian in Hartree/(amu Bohr^2), or a stacked
+   array of them, and returns the eigenvalues in cm-2 (signed squared wavenumbers)
+   """
+   return solve_eigenvalues(mw_hessmat * UNIT_CONVERSION)
+
+@profiling.timed("eigvalsh")
+def solve_eigenvalues(matrices):
+   # Eigenvalues of a symmetric matrix, or a stack of them, of which only the lower
+   # triangle is read (NumPy's eigvalsh takes its own copy for LAPACK)
+   if profiling.enabled:
+      shape = np.shape(matrices)
+      profiling.count("eigen-solves (n=%d)" % shape[-1], int(np.prod(shape[:-2])))
+   return np.linalg.eigvalsh(matrices)
+
+class EigenvalueMemo:
+   # An in-process LRU memo of isotopologue eigenvalues, keyed by the identity of the parsed
+   # structure (Structure.key, or the object itself) and the isotopologue mass vector. Labels
+   # that give the same masses (e.g. equivalent atoms listed in another order, or atoms with
+   # no heavier isotope defined) and later calls on the same file share one diagonalization
+   def __init__(self, max_entries=1024):
+      self.max_entries = max_entries
+      self.hits, self.misses = 0, 0
+      self.entries = OrderedDict()
+      self.lock = threading.Lock()
+
+   def key(self, structure, masses):
+      identity = structure.key if structure.key is not None else id(structure)
+      return identity, np.ascontiguousarray(masses, dtype=float).tobytes()
+
+   def get(self, structure, key):
+      with self.lock:
+         entry = self.entries.get(key)
+         # an entry keyed by object identity is only valid while that object is alive
+         if entry is not None and (entry[0] is None or entry[0]() is structure):
+            self.entries.move_to_end(key)
+            self.hits += 1; profiling.count("eigenvalue memo hits")
+            return entry[1]
+         self.misses += 1; profiling.count("eigenvalue memo misses")
+         return None
+
+   def put(self, structure, key, eigenvalues):
+      reference = weakref.ref(structure) if structure.key is None else None
+      with self.lock:
+         self.entries[key] = (reference, eigenvalues)
+         self.entries.move_to_end(key)
+         while len(self.entries) > self.max_entries: self.entries.popitem(last=False)
+
+   def clear(self):
+      with self.lock:
+         self.entries.clear()
+         self.hits, self.misses = 0, 0
+
+   def stats(self):
+      return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+# The memo shared by calc_isotopologue_eigenvalues, and so by calc_rpfr and every caller
+eigenvalue_memo = EigenvalueMemo()
+
+def calc_isotopologue_eigenvalues(file, isos, batch_size=32):
+   """
+   Eigenvalues (cm-2) of the mass-weighted Hessian of each isotopologue in isos,
+   diagonalized together as stacked batches of up to batch_size matrices (fewer
+   for large molecules, to keep within EIGEN_BATCH_BYTES). The packed force constants
+   of each isotopologue are expanded, mass-weighted and converted to cm-2 in one pass
+   into a work array that is reused for every batch. Each distinct mass vector is
+   diagonalized once and kept in eigenvalue_memo. For a structure loaded through a
+   HessianCache, eigenvalues that are not in the memo are read back from an earlier
+   run, and new ones are stored. A structure loaded through a MemoryCache keeps its eigenvalues there
+   instead of in the memo, within the memory limit of the cache
+   """
+   structure = as_structure(file)
+   cache = structure.cache
+   memo = None if getattr(cache, "resident", False) else eigenvalue_memo
+   masses = [isotopologue_masses(structure, iso) for iso in isos]
+   keys = [eigenvalue_memo.key(structure, mass) for mass in masses]
+
+   found, todo = {}, []
+   for k, key in enumerate(keys):
+      if key in found: continue
+      # the memo first, as a hit costs no file access; eigenvalues read from the cache join it
+      eigs = memo.get(structure, key) if memo is not None else None
+      if eigs is not None:
+         if cache is not None: cache.keep_eigenvalues(structure, masses[k], eigs)
+      elif cache is not None:
+         eigs = cache.load_eigenvalues(structure, masses[k])
+         if eigs is not None and memo is not None: memo.put(structure, key, eigs)
+      # None marks a mass vector waiting to be diagonalized
+      found[key] = eigs
+      if eigs is None: todo.append(k)
+
+   if todo:
+      d_o_f = 3 * structure.natoms
+      batch_size = max(1, min(batch_size, len(todo), EIGEN_BATCH_BYTES // (8 * d_o_f**2)))
+      work = np.zeros((batch_size, d_o_f, d_o_f))
+      for first in range(0, len(todo), batch_size):
+         batch = todo[first:first + batch_size]
+         for j, k in enumerate(batch): read_hess(structure, isos[k], work[j], UNIT_CONVERSION, symmetric=False)
+         for k, eigs in zip(batch, solve_eigenvalues(work[:len(batch)])):
+            found[keys[k]] = eigs
+            if memo is not None: memo.put(structure, keys[k], eigs)
+            if cache is not None: cache.save_eigenvalues(structure, masses[k], eigs)
+   return [found[key] for key in keys]
+
+@profiling.timed("eigh")
+def solve_eigensystem(matrix):
+   # Eigenvalues and eigenvectors of a symmetric matrix, of which only the lower triangle is read
+   if profiling.enabled: profiling.count("eigen-solves (n=%d)" % np.shape(matrix)[-1])
+   return np.linalg.eigh(matrix)
+
+def calc_normal_modes(file):
+   """
+   Eigenvalues (cm-2) and eigenvectors (columns) of the mass-weighted Hessian of
+   the unsubstituted structure, from which estimate_isotopologue_eigenvalues
+   estimates those of its isotopologues without diagonalizing them
+   """
+   structure = as_structure(file)
+   eigs, modes = solve_eigensystem(read_hess(structure, '0', factor=UNIT_CONVERSION, symmetric=False))
+   eigenvalue_memo.put(structure, eigenvalue_memo.key(structure, isotopologue_masses(structure, '0')), eigs)
+   return eigs, modes
+
+@profiling.timed("isotope shifts")
+def estimate_isotopologue_eigenvalues(file, normal_modes, iso):
+   """
+   Two first-order estimates of the eigenvalues (cm-2) of an isotopologue from the
+   normal modes of the unsubstituted structure. Substitution only rescales the rows
+   and columns of the substituted atoms, H = D H0 D with D = sqrt(m/m'), so each mode
+   u of H0 gives (a) the Rayleigh quotient u'Hu and (b) the eigenvalue of the pencil
+   H0 - lambda (1 + C) with C = D^-2 - 1 restricted to u, lambda0 / (1 + u'Cu).
+   Both cost O(3N) per mode for a single substituted atom. In practice the isotope
+   effects from (a) and (b) lie on either side of the exact one, so their spread
+   estimates the error of (a)
+   """
+   structure = as_structure(file)
+   eigs, modes = normal_modes
+   ratio = np.repeat(isotopologue_masses(structure, iso) / structure.masses, 3)
+   dofs = np.flatnonzero(ratio != 1.0)
+   if len(dofs) == 0: return eigs, eigs
+
+   # the substituted rows of the modes, and of the unsubstituted Hessian H0 = U diag(eigs) U'
+   rows = modes[dofs]
+   shift = rows * (1.0 / np.sqrt(ratio[dofs]) - 1.0)[:, np.newaxis]
+   block = np.dot(rows * eigs, rows.T)
+   rayleigh = eigs * (1.0 + 2.0 * np.sum(shift * rows, axis=0)) + np.sum(shift * np.dot(block, shift), axis=0)
+   pencil = eigs / (1.0 + np.sum(rows**2 * (ratio[dofs] - 1.0)[:, np.newaxis], axis=0))
+   return np.sort(rayleigh), np.sort(pencil)
 
 class calc_rpfr:
    #Computes the Reduced Isotopic Partition Function Ratio from a structure and a given isotopic substitution
-   def __init__(self, files, isomer, temperature=298.15, freq_scale_factor=1.0, freq_cutoff=50.0):
+   #files may be filenames or already-parsed Structure objects. Eigenvalues from calc_eigenvalues
+   #can be supplied (one array per file) when the Hessians have already been diagonalized.
+   #The modes kept from each file are recorded in modes; passing those of the unlabelled
+   #isotopologue keeps the same modes of the labelled one, as a cutoff model requires
+   @profiling.timed("factor sums")
+   def __init__(self, files, isomer, temperature=298.15, freq_scale_factor=1.0, freq_cutoff=50.0, eigenvalues=None, modes=None):
 
       self.PF, self.ZPE, self.EXC = 0.0, 0.0, 0.0
+      self.modes = []
 
       for i, file in enumerate(files):
           # Frequencies in waveunmbers
           self.frequency_wn = []
+          structure = as_structure(file)
 
-          # Extract the Force constants from a g09 logfile and generate the
-          # mass-weighted Hessian matrix in Hartree/(amu Bohr^2)
-          mw_hessmat = read_hess(file, isomer[i])
-          
-          # Convert from atomic units - a bit ugly
-          unit_conversion = ENERGY_AU / (BOHR_RADIUS**2 * ATOMIC_MASS_UNIT) / ((SPEED_OF_LIGHT * 2 * np.pi)**2)
-          eigs = np.linalg.eigvalsh(mw_hessmat * unit_conversion)
+          # Diagonalize the mass-weighted Hessian matrix generated from the Force
+          # constants parsed from a g09 logfile, unless eigenvalues were supplied
+          if eigenvalues is None: eigs = calc_isotopologue_eigenvalues(structure, [isomer[i]])[0]
+          else: eigs = eigenvalues[i]
           freqs = [ np.copysign(np.sqrt(np.abs(freq)),freq) * freq_scale_factor for freq in eigs ]
 
-          # 5 or 6 small normal modes will be removed (depending on whether the molecule is linear or non-linear)
-          if is_linear(file) == 'linear': trans_rot_modes = 5
-          else: trans_rot_modes = 6
+          if modes is not None: imaginary, kept = modes[i]
+          else:
+             # 5 or 6 small normal modes will be removed (depending on whether the molecule is linear or non-linear)
+             # A cutoff model (a Hessian block of a larger system) has no translations or rotations,
+             # but any of its modes below the cut-off are left out
+             if structure.parent is not None: trans_rot_modes = 0
+             elif is_linear(structure) == 'linear': trans_rot_modes = 5
+             else: trans_rot_modes = 6
 
-          # Keep a single imaginary frequency. It should be larger than the predefined cut-off
-          if np.abs(freqs[0]) > freq_cutoff:
-             self.im_frequency_wn = -1.0 * freqs[0]
-             trans_rot_modes = trans_rot_modes + 1
-          for freq in freqs[trans_rot_modes:]: self.frequency_wn.append(freq)
+             # Keep a single imaginary frequency. It should be larger than the predefined cut-off
+             # (a cutoff model has no zero modes, so its lowest mode is only imaginary if negative)
+             imaginary = (structure.parent is None and np.abs(freqs[0]) > freq_cutoff) or freqs[0] < -freq_cutoff
+             if imaginary: trans_rot_modes = trans_rot_modes + 1
+             kept = np.arange(trans_rot_modes, len(freqs))
+             if structure.parent is not None: kept = kept[np.abs(np.asarray(freqs)[kept]) > freq_cutoff]
+          self.modes.append((imaginary, kept))
+          if imaginary: self.im_frequency_wn = -1.0 * freqs[0]
+          self.frequency_wn = [freqs[k] for k in kept]
 
           wns = [("%0.2f") % wn for wn in self.frequency_wn]
           wns = [float(wn) for wn in wns]
@@ -182,29 +453,49 @@ class calc_rpfr:
           self.ZPE += calc_zpe_factor(self.frequency_wn, temperature)
           self.EXC += calc_excitation_factor(self.frequency_wn, temperature)
 
-def compute_isotope_effect(rct, ts, prd, label, temperature=298.15, freq_scale_factor=1.0, freq_cutoff=50.0):
-   # Calculates the RPFR for each species and its isotopomer
-   KIE = []
+class calc_rpfr_grid:
+   #The terms of calc_rpfr on a grid of temperatures (rows) and vibrational scaling factors (columns)
+   #Each Hessian is diagonalized once: temperature and scaling only enter after eigvalsh
+   @profiling.timed("factor sums")
+   def __init__(self, files, isomer, temperatures, freq_scale_factors, freq_cutoff=50.0):
+      temperatures = np.asarray(temperatures, dtype=float)
+      scales = np.asarray(freq_scale_factors, dtype=float)
+      self.PF = np.zeros(len(scales))
+      self.ZPE, self.EXC = np.zeros((len(temperatures), len(scales))), np.zeros((len(temperatures), len(scales)))
 
-   for iso in [['0'] * len(rct), label[0:len(rct)]]:
-       rpfr = calc_rpfr(rct, iso, temperature, freq_scale_factor, freq_cutoff)
-       KIE.append(rpfr)
+      for i, file in enumerate(files):
+          structure = as_structure(file)
+          eigs = calc_isotopologue_eigenvalues(structure, [isomer[i]])[0]
+          wns = np.copysign(np.sqrt(np.abs(eigs)), eigs)
 
-   if ts != None:
-       for iso in [['0'] * len(ts), label[len(rct):]]:
-           rpfr = calc_rpfr(ts, iso, temperature, freq_scale_factor, freq_cutoff)
-           KIE.append(rpfr)
+          # 5 or 6 small normal modes will be removed (depending on whether the molecule is linear or non-linear)
+          if is_linear(structure) == 'linear': trans_rot_modes = 5
+          else: trans_rot_modes = 6
+
+          # Keep a single imaginary frequency wherever, once scaled, it is larger than the cut-off
+          imaginary = np.abs(wns[0] * scales) > freq_cutoff
+          if imaginary.any(): self.im_frequency_wn = np.where(imaginary, -1.0 * wns[0] * scales, np.nan)
 
+          # scaling factors that keep the same modes are evaluated together
+          for skip, columns in [(trans_rot_modes, ~imaginary), (trans_rot_modes + 1, imaginary)]:
+             if not columns.any(): continue
+             frequency_wn = np.outer(scales[columns], wns[skip:])
+             self.PF[columns] += calc_product_factor(frequency_wn)
+             self.ZPE[:, columns] += calc_zpe_factor(frequency_wn, temperatures[:, np.newaxis])
+             self.EXC[:, columns] += calc_excitation_factor(frequency_wn, temperatures[:, np.newaxis])
+
+def isotope_effect_from_rpfrs(KIE, temperature=298.15, ts=True):
+   """
+   Combines the four RPFRs (reactant, labelled reactant, TS or product, labelled
+   TS or product) with the Bigeleisen-Mayer equation, plus a Bell tunnelling
+   correction when the second species is a transition structure
+   """
+   if ts:
        # Check for the presence of an imaginary frequency in second structure
        if hasattr(KIE[2], "im_frequency_wn") and hasattr(KIE[3], "im_frequency_wn"):
            freq_fac = KIE[2].im_frequency_wn/KIE[3].im_frequency_wn
        else: raise ValueError("Kinisot requires a transition structure with an imaginary frequency!")
-
-   elif prd != None:
-     for iso in [['0'] * len(prd), label[len(rct):]]:
-         rpfr = calc_rpfr(prd, iso, temperature, freq_scale_factor, freq_cutoff)
-         KIE.append(rpfr)
-     freq_fac = 1.0
+   else: freq_fac = 1.0
 
    # Application of the Bigeleisen-Mayer equation
    ZPE = np.e ** (KIE[0].ZPE - KIE[1].ZPE - KIE[2].ZPE + KIE[3].ZPE)
@@ -214,7 +505,7 @@ def compute_isotope_effect(rct, ts, prd, label, temperature=298.15, freq_scale_f
    # A correction factor for QM-tunneling (Bell infinite parabola)
    # Conversion from wavenumbers to SI energy units; then divide by kT
    tofreq = SPEED_OF_LIGHT * PLANCK_CONSTANT / BOLTZMANN_CONSTANT / temperature
-   if ts != None: parabolic_tunn_corr = freq_fac * math.sin(0.5 * tofreq * KIE[3].im_frequency_wn) / math.sin(0.5 * tofreq * KIE[2].im_frequency_wn)
+   if ts: parabolic_tunn_corr = freq_fac * math.sin(0.5 * tofreq * KIE[3].im_frequency_wn) / math.sin(0.5 * tofreq * KIE[2].im_frequency_wn)
    else: parabolic_tunn_corr = 1.0
 
    # (a) the Bigeleisen-Mayer KIE with classical nuclei and (b) a value corrected to include quantum tunneling effects...
@@ -223,20 +514,483 @@ def compute_isotope_effect(rct, ts, prd, label, temperature=298.15, freq_scale_f
 
    return KIE, ZPE, EXC, TRPF, KIE_no_tunnel, KIE_tunnel, parabolic_tunn_corr, freq_fac
 
+# Worker threads shared by every async load, so that they outlive each event loop
+_executor = None
+
+def worker_threads():
+   global _executor
+   if _executor is None:
+      from concurrent.futures import ThreadPoolExecutor
+      _executor = ThreadPoolExecutor(thread_name_prefix="kinisot")
+   return _executor
+
+def run_sync(coroutine):
+   # Runs a coroutine to completion from synchronous code: in this thread, or in a
+   # helper thread when this one is already running an event loop (e.g. in Jupyter)
+   import asyncio
+   try: asyncio.get_running_loop()
+   except RuntimeError: return asyncio.run(coroutine)
+   from concurrent.futures import ThreadPoolExecutor
+   with ThreadPoolExecutor(1) as pool: return pool.submit(asyncio.run, coroutine).result()
+
+async def load_structures_async(files, concurrency=4, cache=None, return_exceptions=False):
+   """
+   Reads and parses output files in worker threads, at most concurrency at a time,
+   so that waiting on a slow filesystem overlaps with parsing. Returns the Structures
+   in the order of files; Structures pass through and repeated files are loaded once.
+   With return_exceptions, a file that cannot be loaded gives its exception instead
+   """
+   import asyncio
+   loop, limit = asyncio.get_running_loop(), asyncio.Semaphore(concurrency)
+
+   async def load(file):
+      if isinstance(file, Structure): return file
+      async with limit: return await loop.run_in_executor(worker_threads(), as_structure, file, None, cache)
+
+   tasks = {}
+   for file in files:
+      if file not in tasks: tasks[file] = asyncio.ensure_future(load(file))
+   await asyncio.gather(*tasks.values(), return_exceptions=return_exceptions)
+   return [tasks[file].exception() or tasks[file].result() for file in files]
+
+async def load_isotopologues_async(isos, concurrency=4, cache=None):
+   """
+   Loads each file (key of the dict isos) in a worker thread, at most concurrency
+   at a time, and diagonalizes the Hessians of its isotopologues isos[file] as soon
+   as it has been parsed, while other files are still loading. Returns a dict of
+   file -> (Structure, {iso: eigenvalues})
+   """
+   import asyncio
+   loop, limit = asyncio.get_running_loop(), asyncio.Semaphore(concurrency)
+
+   # with every file already parsed there is nothing to overlap, and no need for threads
+   loading = not all(isinstance(file, Structure) for file in isos)
+
+   async def load_and_diagonalize(file):
+      if isinstance(file, Structure): structure = file
+      else:
+         async with limit: structure = await loop.run_in_executor(worker_threads(), as_structure, file, None, cache)
+      if loading: eigenvalues = await loop.run_in_executor(worker_threads(), calc_isotopologue_eigenvalues, structure, isos[file])
+      else: eigenvalues = calc_isotopologue_eigenvalues(structure, isos[file])
+      return structure, dict(zip(isos[file], eigenvalues))
+
+   return dict(zip(isos, await asyncio.gather(*[load_and_diagonalize(file) for file in isos])))
+
+def isotope_effect_request(rct, ts, prd, label, temperature, freq_scale_factor, freq_cutoff, store=None):
+   # The files, store key and stored result (or None) of an isotope effect, and the
+   # unlabelled and labelled isotopologues needed from each distinct file
+   if ts != None: second, kind = ts, "ts"
+   elif prd != None: second, kind = prd, "prd"
+   else: raise ValueError("Kinisot requires either a TS for KIE or a product for EQE!")
+   files, key, KIE = list(rct) + list(second), None, None
+   if store is not None:
+      key = store.key(rct, second, kind, label, temperature, freq_scale_factor, freq_cutoff)
+      KIE = store.get(key)
+   isos = {}
+   for i, file in enumerate(files):
+      for iso in ['0', label[i]]:
+         if iso not in isos.setdefault(file, []): isos[file].append(iso)
+   return files, kind, key, KIE, isos
+
+def isotope_effect_from_loaded(rct, ts, prd, label, loaded, temperature, freq_scale_factor, freq_cutoff, store=None, key=None):
+   # The isotope effect from the Structures and eigenvalues of each file (see
+   # load_isotopologues_async), recorded in the store if there is one
+   second, kind = (ts, "ts") if ts != None else (prd, "prd")
+   files = list(rct) + list(second)
+
+   # Calculates the RPFR for each species and its isotopomer, keeping the modes of the species
+   KIE, n = [], len(rct)
+   for species, labels in [(files[:n], label[0:n]), (files[n:], label[n:])]:
+      structures, modes = [loaded[file][0] for file in species], None
+      for iso in [['0'] * len(species), labels]:
+         eigenvalues = [loaded[file][1][i] for file, i in zip(species, iso)]
+         KIE.append(calc_rpfr(structures, iso, temperature, freq_scale_factor, freq_cutoff, eigenvalues, modes))
+         modes = KIE[-1].modes
+
+   result = isotope_effect_from_rpfrs(KIE, temperature, ts != None)
+   if store is not None: store.put(key, KIE, store_inputs(rct, second, kind, label))
+   return result
+
+async def compute_isotope_effect_async(rct, ts, prd, label, temperature=298.15, freq_scale_factor=1.0, freq_cutoff=50.0, concurrency=4, cache=None, store=None):
+   """
+   compute_isotope_effect with the input files read and parsed concurrently (at most
+   concurrency at a time). The isotopologue Hessians of each file are diagonalized,
+   also in a worker thread, as soon as it has been parsed while the other files are
+   still loading. rct, ts and prd may list filenames or Structures. With a
+   ResultStore, a stored result is returned without parsing the files, and a new
+   one is recorded
+   """
+   files, kind, key, KIE, isos = isotope_effect_request(rct, ts, prd, label, temperature, freq_scale_factor, freq_cutoff, store)
+   if KIE is not None: return isotope_effect_from_rpfrs(KIE, temperature, ts != None)
+   loaded = await load_isotopologues_async(isos, concurrency, cache)
+   return isotope_effect_from_loaded(rct, ts, prd, label, loaded, temperature, freq_scale_factor, freq_cutoff, store, key)
+
+def store_inputs(rct, second, kind, label):
+   # A readable record of the inputs of a stored result
+   name = lambda file: str(file.file if isinstance(file, Structure) else file)
+   return {"rct": [name(file) for file in rct], kind: [name(file) for file in second], "iso": list(label)}
+
+def compute_isotope_effect(rct, ts, prd, label, temperature=298.15, freq_scale_factor=1.0, freq_cutoff=50.0, store=None):
+   # Calculates the RPFR for each species and its isotopomer
+   # rct, ts and prd may list filenames or Structures: each file is parsed only once,
+   # several files being loaded concurrently by compute_isotope_effect_async. Already
+   # parsed Structures, or a single file, take a plain synchronous path without asyncio.
+   # An optional ResultStore is consulted first, and records the result
+   files, kind, key, KIE, isos = isotope_effect_request(rct, ts, prd, label, temperature, freq_scale_factor, freq_cutoff, store)
+   if KIE is not None: return isotope_effect_from_rpfrs(KIE, temperature, ts != None)
+   if len(isos) > 1 and not all(isinstance(file, Structure) for file in isos):
+      loaded = run_sync(load_isotopologues_async(isos))
+   else:
+      loaded = {}
+      for file, iso in isos.items():
+         structure = as_structure(file)
+         loaded[file] = (structure, dict(zip(iso, calc_isotopologue_eigenvalues(structure, iso))))
+   return isotope_effect_from_loaded(rct, ts, prd, label, loaded, temperature, freq_scale_factor, freq_cutoff, store, key)
+
+def expand_conformers(pattern):
+   """
+   The output files of a conformer group given on the command line: every .log,
+   .out and .fchk file (also compressed) in a directory, the files matching a
+   glob such as 'ts_*.log', or else the single file named
+   """
+   if os.path.isdir(pattern):
+      files = [os.path.join(pattern, name) for name in sorted(os.listdir(pattern)) if uncompressed_name(name).endswith(('.log', '.out') + FCHK_EXTENSIONS)]
+   elif any(char in pattern for char in '*?['):
+      import glob
+      files = sorted(glob.glob(pattern))
+   else: return [pattern]
+   if not files: raise ValueError("No output files found for conformers " + pattern + "!")
+   return files
+
+def conformer_weights(energies, temperature=298.15):
+   # Boltzmann populations of conformers from their SCF energies (Hartree)
+   if len(energies) == 1: return np.ones(1)
+   if any(energy is None for energy in energies):
+      raise ValueError("Boltzmann weighting requires an SCF energy for every conformer!")
+   energies = np.asarray(energies, dtype=float)
+   weights = np.exp(-(energies - energies.min()) * ENERGY_AU / (BOLTZMANN_CONSTANT * temperature))
+   return weights / weights.sum()
+
+async def compute_ensemble_isotope_effect_async(rct, ts, prd, label, temperature=298.15, freq_scale_factor=1.0, freq_cutoff=50.0, concurrency=4, cache=None):
+   """
+   The isotope effect of conformer ensembles. rct, ts and prd list one group of
+   conformers (filenames or Structures) per species, and every conformer of a
+   species shares the atom numbering of its label. The RPFR of each conformer
+   is computed once, the conformers being loaded and diagonalized concurrently,
+   and the RPFRs of a species are Boltzmann-averaged with populations from the
+   SCF energies, so the cost grows with the number of conformers rather than
+   of reactant/TS pairs. For a TS the average includes the V-ratio and Bell
+   tunnelling correction of each conformer. Returns a dict of the RESULT_COLUMNS
+   and FREQUENCY_COLUMNS (NaN where they do not apply to an ensemble) with a
+   "conformers" list of dicts: species, file, energy, rel-energy (kcal/mol),
+   weight, rpfr, V-ratio and 1D-tunn
+   """
+   if ts != None: second = ts
+   elif prd != None: second = prd
+   else: raise ValueError("Kinisot requires either a TS for KIE or a product for EQE!")
+   groups = [list(group) for group in rct] + [list(group) for group in second]
+
+   isos = {}
+   for i, group in enumerate(groups):
+      for file in group:
+         for iso in ['0', label[i]]:
+            if iso not in isos.setdefault(file, []): isos[file].append(iso)
+   loaded = await load_isotopologues_async(isos, concurrency, cache)
+
+   tofreq = SPEED_OF_LIGHT * PLANCK_CONSTANT / BOLTZMANN_CONSTANT / temperature
+   KIE_no_tunnel, KIE_tunnel, conformers = 1.0, 1.0, []
+   for i, group in enumerate(groups):
+      is_ts = ts != None and i >= len(rct)
+      structures = [loaded[file][0] for file in group]
+      energies = [structure.scf_energy for structure in structures]
+      weights = conformer_weights(energies, temperature)
+      terms = np.zeros((len(group), 2))
+      for j, (file, structure) in enumerate(zip(group, structures)):
+         light = calc_rpfr([structure], ['0'], temperature, freq_scale_factor, freq_cutoff, [loaded[file][1]['0']])
+         heavy = calc_rpfr([structure], [label[i]], temperature, freq_scale_factor, freq_cutoff, [loaded[file][1][label[i]]])
+         rpfr = math.exp(light.ZPE - heavy.ZPE + light.EXC - heavy.EXC + heavy.PF - light.PF)
+         freq_fac, tunn = 1.0, 1.0
+         if is_ts:
+            if not (hasattr(light, "im_frequency_wn") and hasattr(heavy, "im_frequency_wn")):
+               raise ValueError("Kinisot requires a transition structure with an imaginary frequency! (" + str(structure.file) + ")")
+            freq_fac = light.im_frequency_wn / heavy.im_frequency_wn
+            tunn = freq_fac * math.sin(0.5 * tofreq * heavy.im_frequency_wn) / math.sin(0.5 * tofreq * light.im_frequency_wn)
+         terms[j] = [rpfr / freq_fac, rpfr / (freq_fac * tunn)]
+         relative = None if energies[j] is None or None in energies else (energies[j] - min(energies)) * ENERGY_AU * AVOGADRO_CONSTANT / 4184.0
+         conformers.append({"species": i, "file": str(structure.file), "energy": energies[j], "rel-energy": relative,
+                            "weight": float(weights[j]), "rpfr": rpfr, "V-ratio": freq_fac, "1D-tunn": tunn})
+
+      # Boltzmann-averaged RPFR of the species: reactants multiply the isotope effect, TSs and products divide it
+      average = weights.dot(terms)
+      if i < len(rct): KIE_no_tunnel, KIE_tunnel = KIE_no_tunnel * average[0], KIE_tunnel * average[0]
+      else: KIE_no_tunnel, KIE_tunnel = KIE_no_tunnel / average[0], KIE_tunnel / average[1]
+
+   result = dict((column, np.nan) for column in RESULT_COLUMNS + FREQUENCY_COLUMNS)
+   result.update({"KIE": KIE_no_tunnel, "corr-KIE": KIE_tunnel, "1D-tunn": KIE_tunnel / KIE_no_tunnel, "conformers": conformers})
+   return result
+
+def compute_ensemble_isotope_effect(rct, ts, prd, label, temperature=298.15, freq_scale_factor=1.0, freq_cutoff=50.0, concurrency=4, cache=None):
+   # Boltzmann-weighted isotope effect of conformer groups; see compute_ensemble_isotope_effect_async
+   return run_sync(compute_ensemble_isotope_effect_async(rct, ts, prd, label, temperature, freq_scale_factor, freq_cutoff, concurrency, cache))
+
+def compute_isotope_effect_grid(rct, ts, prd, label, temperatures, freq_scale_factors, freq_cutoff=50.0):
+   """
+   Evaluates the isotope effect of compute_isotope_effect on every combination
+   of the given temperatures and vibrational scaling factors. Each isotopologue
+   is diagonalized once and the Bigeleisen-Mayer terms and Bell tunnelling
+   correction are evaluated over the whole grid with NumPy. Returns a dict with
+   the 1D arrays "T" and "scale" and a (len(T), len(scale)) array for each of
+   RESULT_COLUMNS and FREQUENCY_COLUMNS (NaN for an EQE).
+   """
+   temperatures = np.atleast_1d(np.asarray(temperatures, dtype=float))
+   scales = np.atleast_1d(np.asarray(freq_scale_factors, dtype=float))
+   KIE, parsed = [], {}
+   rct = [as_structure(file, parsed) for file in rct]
+   if ts != None: second = [as_structure(file, parsed) for file in ts]
+   elif prd != None: second = [as_structure(file, parsed) for file in prd]
+   else: raise ValueError("Kinisot requires either a TS for KIE or a product for EQE!")
+
+   for species, isos in [(rct, [['0'] * len(rct), label[0:len(rct)]]), (second, [['0'] * len(second), label[len(rct):]])]:
+      for iso in isos:
+         KIE.append(calc_rpfr_grid(species, iso, temperatures, scales, freq_cutoff))
+
+   ones = np.ones((len(temperatures), len(scales)))
+   if ts != None:
+      # Check for the presence of an imaginary frequency in second structure at every scaling factor
+      if not (hasattr(KIE[2], "im_frequency_wn") and hasattr(KIE[3], "im_frequency_wn")) or \
+            np.isnan(KIE[2].im_frequency_wn).any() or np.isnan(KIE[3].im_frequency_wn).any():
+         raise ValueError("Kinisot requires a transition structure with an imaginary frequency!")
+      freq_fac = ones * KIE[2].im_frequency_wn / KIE[3].im_frequency_wn
+
+      # Bell infinite parabola, with hc/kT for every temperature down the rows
+      tofreq = (SPEED_OF_LIGHT * PLANCK_CONSTANT / BOLTZMANN_CONSTANT / temperatures)[:, np.newaxis]
+      parabolic_tunn_corr = freq_fac * np.sin(0.5 * tofreq * KIE[3].im_frequency_wn) / np.sin(0.5 * tofreq * KIE[2].im_frequency_wn)
+      im_frequencies = [ones * KIE[2].im_frequency_wn, ones * KIE[3].im_frequency_wn]
+   else: freq_fac, parabolic_tunn_corr, im_frequencies = ones, ones, [ones * np.nan, ones * np.nan]
+
+   # Application of the Bigeleisen-Mayer equation
+   ZPE = np.exp(KIE[0].ZPE - KIE[1].ZPE - KIE[2].ZPE + KIE[3].ZPE)
+   EXC = np.exp(KIE[0].EXC - KIE[1].EXC - KIE[2].EXC + KIE[3].EXC)
+   TRPF = ones * np.exp(KIE[2].PF - KIE[3].PF - KIE[0].PF + KIE[1].PF)
+   KIE_no_tunnel = freq_fac * ZPE * EXC * TRPF
+
+   return dict(zip(["T", "scale"] + RESULT_COLUMNS + FREQUENCY_COLUMNS, [temperatures, scales, freq_fac, ZPE, EXC, TRPF,
+                   KIE_no_tunnel, parabolic_tunn_corr, KIE_no_tunnel * parabolic_tunn_corr] + im_frequencies))
+
+# Column names for tabulated isotope effects, as printed in the output header
+RESULT_COLUMNS = ["V-ratio", "ZPE", "EXC", "TRPF", "KIE", "1D-tunn", "corr-KIE"]
+
+# Imaginary frequencies (cm-1) of the unlabelled and labelled TS in machine-readable results
+FREQUENCY_COLUMNS = ["im-freq", "im-freq-iso"]
+
+def imaginary_frequencies(KIE, ts=True):
+   # The FREQUENCY_COLUMNS values from the four RPFRs of an isotope effect (NaN for an EQE)
+   if not ts: return {"im-freq": np.nan, "im-freq-iso": np.nan}
+   return {"im-freq": KIE[2].im_frequency_wn, "im-freq-iso": KIE[3].im_frequency_wn}
+
+def scan_isotope_effects(rct, ts, prd, sites=None, elements=None, temperature=298.15, freq_scale_factor=1.0, freq_cutoff=50.0, batch_size=32, store=None, radius=None, bonds=None, screen=None):
+   """
+   Computes the isotope effect for every labelled site of a single reactant and
+   a single TS (KIE) or product (EQE) that share the same atom numbering, as in
+   examples/gaussian/claisen_kinisot.sh. sites is a list of labels such as
+   ['5', '7,8']; by default every atom with an isotopic substitution is scanned,
+   optionally only those of the listed elements. Each file is parsed once, the
+   unsubstituted Hessian is diagonalized once, and the isotopologue Hessians
+   are diagonalized together as stacked arrays of up to batch_size matrices.
+   With a radius (Angstrom) and/or a number of bonds, each site is instead
+   computed from cutoff models of both structures around it (see cutoff_model);
+   a site whose TS model has no imaginary frequency is computed from the full
+   structures instead, with a warning.
+   With a ResultStore, stored sites are not recomputed and each batch of new
+   sites is recorded as soon as it is done, so an interrupted scan resumes.
+   With a screen tolerance, each species is instead diagonalized once with its
+   normal modes and the isotopologue frequencies are estimated from them (see
+   estimate_isotopologue_eigenvalues); only sites whose estimated relative error
+   in the tunnelling-corrected isotope effect exceeds screen are diagonalized.
+   This pays off for heavy-atom (13C, 18O, ...) labels; sites with a hydrogen
+   label are always diagonalized, with an error of NaN.
+   Returns one dict per site with the label and the RESULT_COLUMNS and
+   FREQUENCY_COLUMNS values, plus with a screen the estimated "error" and whether
+   the site was "refined". Screened estimates are not recorded in a store.
+   """
+   second, kind = (ts, "ts") if ts != None else (prd, "prd")
+   if len(rct) != 1 or second == None or len(second) != 1:
+      raise ValueError("A scan requires a single reactant and a single TS or product!")
+   parsed = {}
+   rct, second = as_structure(rct[0], parsed), as_structure(second[0], parsed)
+   if rct.natoms != second.natoms:
+      raise ValueError("A scan requires the same atom numbering in both structures!")
+
+   if sites == None: sites = [str(atom) for atom in substitutable_atoms(rct, elements)]
+
+   # the structures and labels of each site: the whole structures, or cutoff models around the site
+   truncated = radius is not None or bonds is not None
+   models = {}
+   for site in OrderedDict.fromkeys(sites):
+      if truncated: models[site] = cutoff_model([rct, second], [site, site], radius, bonds)
+      else: models[site] = ([rct, second], [site, site])
+
+   # the four RPFRs of each site: from the store, or computed below
+   found, keys = {}, {}
+   if store is not None:
+      for site, (structures, labels) in models.items():
+         keys[site] = store.key(structures[:1], structures[1:], kind, labels, temperature, freq_scale_factor, freq_cutoff)
+         KIE = store.get(keys[site])
+         if KIE is not None: found[site] = KIE
+   missing = [site for site in models if site not in found]
+
+   def record(site, KIE):
+      found[site] = KIE
+      if store is not None: store.put(keys[site], KIE, store_inputs([rct], [second], kind, [site, site]))
+
+   # a few small diagonalizations for each site of a cutoff model. The TS model of a site can
+   # lose the imaginary mode when the reaction coordinate reaches beyond it: such a site is
+   # computed from the full Hessians below instead, with a warning
+   if truncated:
+      fallback = []
+      for site in missing:
+         structures, labels = models[site]
+         KIE = []
+         for structure, label in zip(structures, labels):
+            KIE.append(calc_rpfr([structure], ['0'], temperature, freq_scale_factor, freq_cutoff))
+            KIE.append(calc_rpfr([structure], [label], temperature, freq_scale_factor, freq_cutoff, modes=KIE[-1].modes))
+         if ts != None and not all(hasattr(rpfr, "im_frequency_wn") for rpfr in KIE[2:]):
+            warnings.warn("The cutoff model of site " + site + " has no imaginary frequency: computed from the full Hessians")
+            fallback.append(site)
+         else: record(site, KIE)
+      missing = fallback
+
+   # first-order estimates from the normal modes of each species, kept if they are close enough
+   # Hydrogen labels shift the modes too far for a first-order estimate to pass any useful
+   # tolerance, so they go straight to the exact path, and without them nothing is estimated
+   errors, refined = {}, set()
+   if screen is not None:
+      hydrogen = lambda site: any(rct.masses[int(atom) - 1] < 3.0 for atom in site.split(',') if 0 < int(atom) <= rct.natoms)
+      for site in missing:
+         if hydrogen(site): errors[site] = np.nan; refined.add(site)
+   if screen is not None and len(refined) < len(missing):
+      normal_modes = [calc_normal_modes(structure) for structure in [rct, second]]
+      parents = [calc_rpfr([structure], ['0'], temperature, freq_scale_factor, freq_cutoff, eigenvalues=[modes[0]])
+                 for structure, modes in zip([rct, second], normal_modes)]
+      refine = [site for site in missing if site in refined]
+      for site in missing:
+         if site in refined: continue
+         estimates = [estimate_isotopologue_eigenvalues(structure, modes, site) for structure, modes in zip([rct, second], normal_modes)]
+         KIEs = [[parents[0], calc_rpfr([rct], [site], temperature, freq_scale_factor, freq_cutoff, eigenvalues=[estimates[0][k]]),
+                  parents[1], calc_rpfr([second], [site], temperature, freq_scale_factor, freq_cutoff, eigenvalues=[estimates[1][k]])]
+                 for k in range(2)]
+         try:
+            values = [isotope_effect_from_rpfrs(KIE, temperature, ts != None)[5] for KIE in KIEs]
+            errors[site] = abs(values[1] / values[0] - 1.0)
+         except ValueError: errors[site] = np.inf
+         if errors[site] <= screen: found[site] = KIEs[0]
+         else: refine.append(site); refined.add(site)
+      missing = refine
+   if screen is not None: profiling.count("sites refined", len(refined))
+
+   # RPFRs of every isotopologue of each species from batched diagonalizations
+   for first in range(0, len(missing), batch_size):
+      isos = ['0'] + missing[first:first + batch_size]
+      rpfrs = []
+      for structure in [rct, second]:
+         eigenvalues = calc_isotopologue_eigenvalues(structure, isos, batch_size)
+         rpfrs.append([calc_rpfr([structure], [iso], temperature, freq_scale_factor, freq_cutoff, eigenvalues=[eigs])
+                       for iso, eigs in zip(isos, eigenvalues)])
+      for k, site in enumerate(isos[1:]):
+         record(site, [rpfrs[0][0], rpfrs[0][k + 1], rpfrs[1][0], rpfrs[1][k + 1]])
+
+   results = []
+   for site in sites:
+      KIE = found[site]
+      values = isotope_effect_from_rpfrs(KIE, temperature, ts != None)
+      row = {"label": site}
+      row.update(zip(RESULT_COLUMNS, [values[7], values[1], values[2], values[3], values[4], values[6], values[5]]))
+      row.update(imaginary_frequencies(KIE, ts != None))
+      if screen is not None: row.update(error=errors.get(site, 0.0), refined=site in refined)
+      results.append(row)
+   return results
+
+def cutoff_model(files, label, radius=None, bonds=None):
+   """
+   Cuts each species down to a cutoff model in the spirit of Stern and Wolfsberg:
+   the atoms within radius Angstrom and/or bonds bonds of its labelled atoms, with
+   the block of the full Hessian between them. The isotope effect of the models
+   approaches the full one as the radius grows, at the cost of (3n)^3 rather than
+   (3N)^3 per diagonalization. Returns the Structures and the renumbered labels,
+   which can be passed to compute_isotope_effect
+   """
+   models = [truncate_isotopologue(file, iso, radius, bonds) for file, iso in zip(files, label)]
+   return [model[0] for model in models], [model[1] for model in models]
+
 
 def main():
+   # Subcommands, e.g. python -m kinisot batch manifest.csv --jobs 8
+   if len(sys.argv) > 1 and sys.argv[1] == "batch":
+      try: from .batch import batch_main
+      except ImportError: from batch import batch_main
+      return batch_main(sys.argv[2:])
+   if len(sys.argv) > 1 and sys.argv[1] == "bench":
+      try: from .benchmark import bench_main
+      except ImportError: from benchmark import bench_main
+      return bench_main(sys.argv[2:])
+   if len(sys.argv) > 1 and sys.argv[1] == "serve":
+      try: from .server import serve_main
+      except ImportError: from server import serve_main
+      return serve_main(sys.argv[2:])
+   if len(sys.argv) > 1 and sys.argv[1] == "watch":
+      try: from .watch import watch_main
+      except ImportError: from watch import watch_main
+      return watch_main(sys.argv[2:])
+
     # Parse Arguments
    parser = ArgumentParser()
    parser.add_argument("-t", dest="temperature", action="store", type=float, default=298.15, help="temperature in Kelvin (default 298.15K)")
    parser.add_argument("-s", dest="freq_scale_factor", action="store", type=float, default=False, help="scale factor for vibrations (default 1)")
-   parser.add_argument("--iso", dest="label", action='append', required=True, help="atom number(s) of interest")
+   parser.add_argument("--iso", dest="label", action='append', help="atom number(s) of interest")
+   parser.add_argument("--trange", dest="trange", nargs=3, type=float, metavar=("TMIN", "TMAX", "N"), help="evaluate on a grid of N temperatures from TMIN to TMAX")
+   parser.add_argument("--srange", dest="srange", nargs=3, type=float, metavar=("SMIN", "SMAX", "N"), help="evaluate on a grid of N vibrational scale factors from SMIN to SMAX")
+   parser.add_argument("--scan", dest="scan", nargs='?', const="all", default=None, help="compute the isotope effect at every atom, or every atom of the listed elements (e.g. --scan H,C)")
+   parser.add_argument("--screen", dest="screen", nargs='?', type=float, const=1e-3, default=None, help="with --scan, estimate each heavy-atom site from the unsubstituted normal modes and only diagonalize those with an estimated relative error above SCREEN (default 1e-3); H/D sites are always diagonalized")
    parser.add_argument("--cutoff", dest="freq_cutoff", action="store", type=float, default=50.0, help="Frequency cutoff (default = 50 cm-1)")
    parser.add_argument("--rct", dest="rct", action='append', required=True, help="Reactant logfile")
    parser.add_argument("--prd", dest="prd", action='append', help="Product logfile (for EQE calculation)")
    parser.add_argument("--ts", dest="ts", action='append', help="TS logfile (for KIE calculation)")
+   parser.add_argument("--truncate", dest="radius", action="store", type=float, default=None, help="cutoff model: only use atoms within RADIUS Angstrom of the labelled atoms")
+   parser.add_argument("--truncate-bonds", dest="bonds", action="store", type=int, default=None, help="cutoff model: only use atoms within N bonds of the labelled atoms")
+   parser.add_argument("--cache", dest="cache", action="store", default=None, help="directory in which to cache parsed Hessians and eigenvalues between runs")
+   parser.add_argument("--cache-size", dest="cache_size", action="store", type=float, default=512.0, help="maximum size of the cache directory in MB (default 512)")
+   parser.add_argument("--store", dest="store", action="store", default=None, help="SQLite file of computed isotope effects to reuse and add to, e.g. to resume an interrupted scan")
+   parser.add_argument("--format", dest="format", choices=["csv", "jsonl", "npz"], default=None, help="also write the results in a machine-readable format")
+   parser.add_argument("-o", dest="output", default=None, help="file for the --format results (default Kinisot_output.csv/.jsonl/.npz)")
+   parser.add_argument("--quiet", dest="quiet", action="store_true", default=False, help="write Kinisot_output.dat without echoing it to the terminal")
+   parser.add_argument("--profile", dest="profile", action="store_true", default=False, help="print the time spent in each phase (file reads, parsing, mass-weighting, eigvalsh, ...)")
+   parser.add_argument("--profile-json", dest="profile_json", nargs='?', const="Kinisot_profile.json", default=None, help="also write the profile as JSON (default Kinisot_profile.json)")
    
    options, args = parser.parse_known_args()
-   log = Logger("Kinisot","dat", "output")
+   log = Logger("Kinisot","dat", "output", options.quiet)
+
+   if options.profile or options.profile_json != None: profiling.enable()
+   start = time.perf_counter()
+   run_kinisot(options, log)
+
+   # Time spent in each phase, excluding the phases nested inside it
+   if profiling.enabled:
+      result = profiling.report(time.perf_counter() - start)
+      log.Write("\n  Profile\n" + "\n".join(profiling.format_report(result)) + "\n")
+      if options.profile_json != None:
+         import json
+         with open(options.profile_json, 'w') as f: json.dump(result, f, indent=1)
+
+def write_output(options, rows):
+   # Writes result rows in the --format requested, if any
+   if options.format == None: return
+   try: from .output import ResultWriter
+   except ImportError: from output import ResultWriter
+   with ResultWriter(options.output or "Kinisot_output." + options.format, options.format) as writer:
+      writer.write_rows(rows)
+
+def run_kinisot(options, log):
+   # The calculation requested by the command-line options of main()
 
    if options.ts == None and options.prd == None:
        log.Fatal('   Kinisot requires either a TS for KIE or a product for EQE! Exiting ...')
@@ -249,26 +1003,119 @@ def main():
    if options.ts != None: files = options.rct + options.ts
    elif options.prd != None: files = options.rct + options.prd
 
-   # if only one set of labels is provided, assume that the atom numbering is the same for rct and ts or rct and prd
-   if len(options.label) == 1: options.label = options.label * 2
-   
-   for i, species in enumerate(files):
-      print("  Species: {} isotopologue: {}".format(species, options.label[i]))
-    
-   if len(files) != len(options.label):
-       log.Fatal("\no  For multiple reactants you need to specify the labels in each!")
+   if options.scan == None:
+      if options.label == None:
+         log.Fatal("\no  Kinisot requires the atom number(s) to substitute (--iso) or a --scan!")
+
+      # if only one set of labels is provided, assume that the atom numbering is the same for rct and ts or rct and prd
+      if len(options.label) == 1: options.label = options.label * 2
+
+      for i, species in enumerate(files):
+         if not options.quiet: print("  Species: {} isotopologue: {}".format(species, options.label[i]))
+
+      if len(files) != len(options.label):
+          log.Fatal("\no  For multiple reactants you need to specify the labels in each!")
+
+   cache = None
+   if options.cache != None:
+      try: from .cache import HessianCache
+      except ImportError: from cache import HessianCache
+      cache = HessianCache(options.cache, int(options.cache_size * 1024**2))
+   store = None
+   if options.store != None:
+      try: from .store import ResultStore
+      except ImportError: from store import ResultStore
+      store = ResultStore(options.store)
+
+   truncated = options.radius != None or options.bonds != None
+   if options.screen != None and (options.scan == None or truncated):
+      log.Fatal("\no  Screening (--screen) requires a --scan of the full structures!")
+   if truncated and (options.trange != None or options.srange != None):
+      log.Fatal("\no  A cutoff model (--truncate) cannot be combined with --trange or --srange!")
+
+   # Directories or globs of conformers give a Boltzmann-weighted ensemble isotope effect
+   try: groups = [expand_conformers(pattern) for pattern in files]
+   except ValueError as e: log.Fatal("\no  " + str(e))
+   if any(group != [pattern] for group, pattern in zip(groups, files)):
+      if options.scan != None or options.trange != None or options.srange != None or truncated:
+         log.Fatal("\no  Conformer ensembles cannot be combined with --scan, --trange, --srange or --truncate!")
+      return run_ensemble(options, log, groups, cache)
+
+   # Parse every output file once; the structures are shared by all later steps
+   parsed = {}
+   try:
+      structures = [as_structure(file, parsed, cache) for file in files]
+   except ValueError as e:
+      log.Fatal("\no  " + str(e))
+   rct = structures[:len(options.rct)]
+   ts = structures[len(options.rct):] if options.ts != None else None
+   prd = structures[len(options.rct):] if options.ts == None else None
    
    # if not specified try to automatically determine the vibrational scaling factor
    if not options.freq_scale_factor: 
-      options.freq_scale_factor = get_frequency_scaling(files, log)
+      options.freq_scale_factor = get_frequency_scaling(structures, log)
+
+   # A cutoff model of each species around its labelled atoms
+   labels = options.label
+   if truncated and options.scan == None:
+      try: models, labels = cutoff_model(structures, options.label, options.radius, options.bonds)
+      except ValueError as e: log.Fatal("\no  " + str(e))
+      for file, structure, model in zip(files, structures, models):
+         log.Write("\n  Cutoff model of " + file + ": " + str(model.natoms) + " of " + str(structure.natoms) + " atoms")
+      rct = models[:len(options.rct)]
+      if options.ts != None: ts = models[len(options.rct):]
+      else: prd = models[len(options.rct):]
 
    log.Write("\n\n" + (space * 17) + "  Temp = " + str(options.temperature) + "K / Vib. scale factor = " + str(options.freq_scale_factor))
    log.Write(("\n  ").ljust(50))
-   log.Write(' {:>10} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10} \n'.format("V-ratio", "ZPE", "EXC", "TRPF", "KIE", "1D-tunn", "corr-KIE"))
+   log.Write(' {:>10} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10} \n'.format(*RESULT_COLUMNS))
+
+   # A scan over every (or every H/C/O...) atom in one process
+   if options.scan != None:
+      elements = None if options.scan == "all" else options.scan.split(',')
+      try:
+         with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            results = scan_isotope_effects(rct, ts, prd, None, elements, options.temperature, options.freq_scale_factor, options.freq_cutoff,
+                                           store=store, radius=options.radius, bonds=options.bonds, screen=options.screen)
+      except ValueError as e:
+         log.Fatal("\no  " + str(e))
+      for warning in caught: log.Write("\no  " + str(warning.message))
+      log.Write('\n' + dash_line)
+      for row in results:
+         log.Write(("\n  iso @ " + row["label"]).ljust(50))
+         log.Write(' '.join(['{:10.6f}'.format(row[column]) for column in RESULT_COLUMNS]))
+         # a screened estimate, with its estimated relative error
+         if options.screen != None and not row["refined"]: log.Write('  ~ {:.1e}'.format(row["error"]))
+      log.Write('\n' + dash_line + '\n')
+      if options.screen != None:
+         log.Write("\n  " + str(sum(not row["refined"] for row in results)) + " of " + str(len(results)) + " sites estimated from the normal modes (~ estimated relative error)\n")
+      write_output(options, (dict(row, iso=row["label"], T=options.temperature, scale=options.freq_scale_factor) for row in results))
+      return
+
+   # Temperature x scale factor grid from a single diagonalization per isotopologue
+   if options.trange != None or options.srange != None:
+      temperatures, scales = [options.temperature], [options.freq_scale_factor]
+      if options.trange != None: temperatures = np.linspace(options.trange[0], options.trange[1], int(options.trange[2]))
+      if options.srange != None: scales = np.linspace(options.srange[0], options.srange[1], int(options.srange[2]))
+      try:
+         grid = compute_isotope_effect_grid(rct, ts, prd, options.label, temperatures, scales, options.freq_cutoff)
+      except ValueError as e:
+         log.Fatal("\no  " + str(e))
+      log.Write('\n' + dash_line)
+      for i, temperature in enumerate(grid["T"]):
+         for j, scale in enumerate(grid["scale"]):
+            log.Write(("\n  KIE @ " + str(temperature) + " K / " + str(scale)).ljust(50))
+            log.Write(' '.join(['{:10.6f}'.format(grid[column][i, j]) for column in RESULT_COLUMNS]))
+      log.Write('\n' + dash_line + '\n')
+      write_output(options, (dict([("iso", ';'.join(options.label)), ("T", temperature), ("scale", scale)] +
+                                  [(column, grid[column][i, j]) for column in RESULT_COLUMNS + FREQUENCY_COLUMNS])
+                             for i, temperature in enumerate(grid["T"]) for j, scale in enumerate(grid["scale"])))
+      return
 
    # Here are the ingredients and final predictions of the isotope effect
    try:
-      KIE, ZPE, EXC, TRPF, KIE_no_tunnel, KIE_tunnel, parabolic_tunn_corr, freq_fac = compute_isotope_effect(options.rct, options.ts, options.prd, options.label, options.temperature, options.freq_scale_factor, options.freq_cutoff)
+      KIE, ZPE, EXC, TRPF, KIE_no_tunnel, KIE_tunnel, parabolic_tunn_corr, freq_fac = compute_isotope_effect(rct, ts, prd, labels, options.temperature, options.freq_scale_factor, options.freq_cutoff, store)
    except ValueError as e:
       log.Fatal("\no  " + str(e))
 
@@ -290,5 +1137,42 @@ def main():
    else: log.Write('{:21.6f} {:10.6f} {:10.6f} {:10.6f} {:10.6f} {:10.6f}'.format(ZPE, EXC, TRPF, KIE_no_tunnel, parabolic_tunn_corr, KIE_tunnel))
    log.Write('\n' + dash_line + '\n')
 
+   row = dict(zip(["iso", "T", "scale"] + RESULT_COLUMNS, [';'.join(options.label), options.temperature, options.freq_scale_factor,
+                  freq_fac, ZPE, EXC, TRPF, KIE_no_tunnel, parabolic_tunn_corr, KIE_tunnel]))
+   row.update(imaginary_frequencies(KIE, options.ts != None))
+   write_output(options, [row])
+
+def run_ensemble(options, log, groups, cache=None):
+   # The Boltzmann-weighted isotope effect of conformer groups, one group per --rct/--ts/--prd
+   n = len(options.rct)
+   if not options.freq_scale_factor:
+      options.freq_scale_factor = get_frequency_scaling([groups[0][0], groups[n][0]], log)
+
+   log.Write("\n\n" + (space * 17) + "  Temp = " + str(options.temperature) + "K / Vib. scale factor = " + str(options.freq_scale_factor))
+   try:
+      result = compute_ensemble_isotope_effect(groups[:n], groups[n:] if options.ts != None else None, groups[n:] if options.ts == None else None,
+                                               options.label, options.temperature, options.freq_scale_factor, options.freq_cutoff, cache=cache)
+   except ValueError as e:
+      log.Fatal("\no  " + str(e))
+
+   # Each conformer: relative SCF energy (kcal/mol), Boltzmann weight, RPFR and, for a TS, V-ratio and tunnelling
+   log.Write(("\n  ").ljust(50))
+   log.Write(' {:>10} {:>10} {:>10} {:>10} {:>10} \n'.format("E(rel)", "weight", "RPFR", "V-ratio", "1D-tunn"))
+   for conformer in result["conformers"]:
+      relative = conformer["rel-energy"] if conformer["rel-energy"] is not None else 0.0
+      log.Write(("\no " + conformer["file"] + ": iso @ " + options.label[conformer["species"]]).ljust(50))
+      log.Write(' {:10.2f} {:10.4f} {:10.6f} {:10.6f} {:10.6f}'.format(relative, conformer["weight"], conformer["rpfr"], conformer["V-ratio"], conformer["1D-tunn"]))
+
+   log.Write("\n\n" + ("  ").ljust(49))
+   log.Write(' {:>10} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10} \n'.format(*RESULT_COLUMNS))
+   log.Write(dash_line)
+   log.Write(("\n  ensemble KIE @ " + str(options.temperature) + " K").ljust(50))
+   log.Write(' ' * 44 + '{:10.6f} {:10.6f} {:10.6f}'.format(result["KIE"], result["1D-tunn"], result["corr-KIE"]))
+   log.Write('\n' + dash_line + '\n')
+
+   row = dict([("iso", ';'.join(options.label)), ("T", options.temperature), ("scale", options.freq_scale_factor)] +
+              [(column, result[column]) for column in RESULT_COLUMNS + FREQUENCY_COLUMNS])
+   write_output(options, [row])
+
 if __name__ == "__main__":
    main()
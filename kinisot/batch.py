@@ -0,0 +1,237 @@
+#!/usr/bin/python
+
+# Comments and/or additions are welcome (send e-mail to:
+# robert.paton@colostate.edu
+
+import os, sys, csv, json, functools
+import multiprocessing, multiprocessing.util
+from argparse import ArgumentParser
+
+# Importing regardless of relative import
+try:
+    from .Kinisot import compute_isotope_effect, get_frequency_scaling, load_structures_async, run_sync, RESULT_COLUMNS
+    from .Hess_to_Freq import as_structure
+except:
+    from Kinisot import compute_isotope_effect, get_frequency_scaling, load_structures_async, run_sync, RESULT_COLUMNS
+    from Hess_to_Freq import as_structure
+
+# Columns describing a job in a manifest; in a CSV manifest several files or labels
+# are separated by ';' (e.g. rct = dienophile.out;diene.out, iso = 0;6;15)
+JOB_COLUMNS = ["rct", "ts", "prd", "iso", "T", "scale", "cutoff"]
+
+# Environment variables that cap the threads used by NumPy's BLAS/LAPACK libraries
+BLAS_THREAD_VARIABLES = ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                         "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS"]
+
+def read_manifest(manifest, directory=None):
+   """
+   Reads a batch manifest: JSON-lines (.jsonl/.json, one object per line) or CSV
+   with a header row, using the JOB_COLUMNS keys. rct, ts, prd and iso may be lists
+   (or ';'-separated strings); T, scale and cutoff are optional. Relative paths are
+   taken relative to the directory, by default that of the manifest. Returns a list
+   of normalized job dicts
+   """
+   jobs, here = [], directory or os.path.dirname(os.path.abspath(manifest))
+   with open(manifest, 'r') as f:
+      if manifest.endswith('.jsonl') or manifest.endswith('.json'):
+         rows = [json.loads(line) for line in f if line.strip()]
+      else:
+         rows = list(csv.DictReader(f))
+   for row in rows: jobs.append(normalize_job(row, here))
+   return jobs
+
+def normalize_job(row, here=""):
+   # A manifest row as a job dict: lists of files and labels, floats for T/scale/cutoff
+   def as_list(value):
+      if value is None or value == "": return None
+      if isinstance(value, str): value = value.split(';')
+      return [str(item).strip() for item in value]
+
+   job = {}
+   for key in ["rct", "ts", "prd"]:
+      files = as_list(row.get(key))
+      job[key] = [os.path.join(here, file) for file in files] if files else None
+   if job["rct"] == None or (job["ts"] == None and job["prd"] == None):
+      raise ValueError("Each job requires rct and either ts or prd: " + str(row))
+   # if only one set of labels is provided, assume the same atom numbering for both species
+   job["iso"] = as_list(row.get("iso")) or ['0']
+   if len(job["iso"]) == 1: job["iso"] = job["iso"] * 2
+   job["T"] = float(row.get("T") or 298.15)
+   job["scale"] = float(row["scale"]) if row.get("scale") not in [None, ""] else None
+   job["cutoff"] = float(row.get("cutoff") or 50.0)
+   return job
+
+def job_files(job):
+   # Every output file a job reads
+   return tuple(sorted(set(job["rct"] + (job["ts"] or []) + (job["prd"] or []))))
+
+# Structures parsed by this (worker) process, shared by every job it runs, and those
+# published by the parent process through shared memory
+_parsed, _shared = {}, {}
+
+def run_job(job, parsed=None, cache=None, store=None):
+   """
+   Runs one manifest job through compute_isotope_effect. Returns the job with the
+   RESULT_COLUMNS values added, or with an "error" message if it could not be run.
+   Structures come from the parsed dict or, failing that, the optional cache. A
+   job found in the optional ResultStore is looked up instead of computed
+   """
+   if parsed is None: parsed = _parsed
+   result = dict(job)
+   try:
+      rct = [as_structure(file, parsed, cache) for file in job["rct"]]
+      ts = [as_structure(file, parsed, cache) for file in job["ts"]] if job["ts"] else None
+      prd = [as_structure(file, parsed, cache) for file in job["prd"]] if job["prd"] else None
+      if len(rct) + len(ts or prd) != len(job["iso"]):
+         raise ValueError("For multiple reactants you need to specify the labels in each!")
+      scale = job["scale"]
+      if scale == None: scale = get_frequency_scaling(rct + (ts or prd))
+      values = compute_isotope_effect(rct, ts, prd, job["iso"], job["T"], scale, job["cutoff"], store)
+      result["scale"] = scale
+      result.update(zip(RESULT_COLUMNS, [values[7], values[1], values[2], values[3], values[4], values[6], values[5]]))
+   except (ValueError, OSError) as e:
+      result["error"] = str(e)
+   return result
+
+def prefetch(jobs, parsed, cache=None):
+   # Reads and parses every file the jobs need concurrently, into the parsed dict.
+   # Files that fail are left out, so that run_job reports the error for its job
+   files = sorted(set(file for job in jobs for file in job_files(job)) - set(parsed))
+   for file, structure in zip(files, run_sync(load_structures_async(files, cache=cache, return_exceptions=True))):
+      if not isinstance(structure, Exception): parsed[file] = structure
+
+def open_store(path):
+   # The ResultStore at path (None for no store), opened once per process
+   if path is None: return None
+   try: from .store import open_store
+   except ImportError: from store import open_store
+   return open_store(path)
+
+def _run_chunk(chunk, store=None):
+   # Worker entry point: a list of (manifest index, job) sharing the same input files.
+   # Their structures are dropped afterwards, so a long-lived worker does not accumulate them
+   _parsed.update(_shared)
+   try:
+      prefetch([job for index, job in chunk], _parsed)
+      return [(index, run_job(job, store=open_store(store))) for index, job in chunk]
+   finally:
+      _parsed.clear()
+
+def _attach_shared(descriptors):
+   # Worker initializer: the structures published by the parent become this worker's parsed
+   # files, and the segments are unmapped when the worker exits
+   try: from .shared import attach
+   except ImportError: from shared import attach
+   _shared.update(attach(descriptors))
+   multiprocessing.util.Finalize(None, _detach_shared, exitpriority=10)
+
+def _detach_shared():
+   try: from .shared import detach
+   except ImportError: from shared import detach
+   _parsed.clear(); _shared.clear()
+   detach()
+
+def job_chunks(jobs, n_jobs=1):
+   # Groups jobs by the files they read, so that each log is parsed once per worker,
+   # and splits large groups so that all workers have something to do
+   groups = {}
+   for index, job in enumerate(jobs):
+      groups.setdefault(job_files(job), []).append((index, job))
+   size = max(1, -(-len(jobs) // max(1, n_jobs)))
+   chunks = []
+   for group in groups.values():
+      for first in range(0, len(group), size): chunks.append(group[first:first + size])
+   return chunks
+
+def run_batch(jobs, n_jobs=1, blas_threads=1, store=None, shared=False):
+   """
+   Runs a list of jobs (from read_manifest) and yields each result dict in manifest
+   order as soon as it and every earlier job has finished. With n_jobs > 1 the
+   groups of jobs sharing input files are spread over a pool of worker processes,
+   each limited to blas_threads BLAS threads to avoid oversubscribing the cores.
+   store is the path of an optional ResultStore shared by all workers. With
+   shared, every input file is parsed once in this process and handed to the
+   workers through shared memory (see SharedStructures), which is released
+   when the run ends
+   """
+   if n_jobs <= 1:
+      # the files of each group are read (together) when its first job comes up, and
+      # dropped after the last job that reads them, so only the files in use are held
+      last_use, parsed = {}, {}
+      for index, job in enumerate(jobs):
+         for file in job_files(job): last_use[file] = index
+      for index, job in enumerate(jobs):
+         prefetch([job], parsed)
+         yield run_job(job, parsed, store=open_store(store))
+         for file in job_files(job):
+            if last_use[file] == index: parsed.pop(file, None)
+      return
+
+   published, initializer = None, None
+   if shared:
+      try: from .shared import SharedStructures
+      except ImportError: from shared import SharedStructures
+      parsed = {}
+      prefetch(jobs, parsed)
+      published = SharedStructures()
+      initializer = functools.partial(_attach_shared, published.publish(parsed))
+
+   try:
+      # Worker processes are spawned (not forked) so that they import NumPy afresh
+      # and pick up the BLAS thread limits from their environment
+      saved = dict((name, os.environ.get(name)) for name in BLAS_THREAD_VARIABLES)
+      for name in BLAS_THREAD_VARIABLES: os.environ[name] = str(blas_threads)
+      try:
+         pool = multiprocessing.get_context("spawn").Pool(n_jobs, initializer)
+      finally:
+         for name, value in saved.items():
+            if value is None: os.environ.pop(name, None)
+            else: os.environ[name] = value
+
+      with pool:
+         done, next_index = {}, 0
+         for results in pool.imap_unordered(functools.partial(_run_chunk, store=store), job_chunks(jobs, n_jobs)):
+            for index, result in results: done[index] = result
+            while next_index in done:
+               yield done.pop(next_index); next_index += 1
+         # let the workers exit normally, releasing what they hold
+         pool.close(); pool.join()
+   finally:
+      # the workers are gone once the pool is left, so the segments can go too
+      if published is not None: published.close()
+
+def write_results(results, out, header=True):
+   # Streams result dicts as CSV rows, with files and labels joined by ';'
+   writer = csv.writer(out)
+   if header: writer.writerow(JOB_COLUMNS + RESULT_COLUMNS + ["error"])
+   for result in results:
+      row = []
+      for column in JOB_COLUMNS + RESULT_COLUMNS + ["error"]:
+         value = result.get(column)
+         if isinstance(value, list): value = ';'.join(value)
+         row.append("" if value is None else value)
+      writer.writerow(row)
+      out.flush()
+
+def batch_main(argv=None):
+   # python -m kinisot batch manifest.csv [--jobs N] [-o results.csv]
+   parser = ArgumentParser(prog="kinisot batch", description="Run the jobs listed in a CSV or JSON-lines manifest")
+   parser.add_argument("manifest", help="manifest of jobs with columns " + ", ".join(JOB_COLUMNS))
+   parser.add_argument("--jobs", dest="jobs", type=int, default=1, help="number of worker processes (default 1)")
+   parser.add_argument("--blas-threads", dest="blas_threads", type=int, default=1, help="BLAS threads per worker process (default 1)")
+   parser.add_argument("-o", dest="output", default=None, help="CSV file for the results (default: standard output)")
+   parser.add_argument("--store", dest="store", default=None, help="SQLite file of computed results: jobs already in it are not recomputed")
+   parser.add_argument("--shared-memory", dest="shared", action="store_true", default=False, help="parse every log once and share the Hessians with the worker processes")
+   options = parser.parse_args(argv)
+
+   try:
+      jobs = read_manifest(options.manifest)
+   except (ValueError, OSError) as e:
+      print("o  " + str(e)); return 1
+
+   out = open(options.output, 'w', newline='') if options.output else sys.stdout
+   try:
+      write_results(run_batch(jobs, options.jobs, options.blas_threads, options.store, options.shared), out)
+   finally:
+      if options.output: out.close()
+   return 0
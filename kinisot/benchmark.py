@@ -0,0 +1,317 @@
+#!/usr/bin/python
+
+# Comments and/or additions are welcome (send e-mail to:
+# robert.paton@colostate.edu
+
+import os, sys, json, math, time, shutil, platform, subprocess, tempfile, tracemalloc
+from argparse import ArgumentParser
+import numpy as np
+
+# Importing regardless of relative import
+try:
+    from .Kinisot import calc_eigenvalues, calc_rpfr, compute_isotope_effect, cutoff_model, eigenvalue_memo
+    from .Hess_to_Freq import Structure, read_hess, level_of_theory, is_linear, rotational_constants, BOHR_TO_ANGSTROM
+except:
+    from Kinisot import calc_eigenvalues, calc_rpfr, compute_isotope_effect, cutoff_model, eigenvalue_memo
+    from Hess_to_Freq import Structure, read_hess, level_of_theory, is_linear, rotational_constants, BOHR_TO_ANGSTROM
+
+# Format of the JSON written by run_benchmarks; bump if the layout changes
+BENCHMARK_FORMAT = 1
+
+# Numbers of atoms in the generated synthetic Gaussian outputs
+BENCHMARK_SIZES = [50, 200, 500]
+
+# Bundled example calculations: name, reactant, TS or product, whether the second
+# species is a TS (a KIE) or a product (an EQE), and the isotopic labels in each
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "examples", "gaussian")
+EXAMPLE_REACTIONS = [("claisen", "claisen_gs.out", "claisen_ts.out", "ts", ["5", "5"]),
+                     ("tetramethylcyclohexane", "tetramethylcyclohexane.out", "tetramethylcyclohexane.out", "prd", ["24,25,26", "28,29,30"]),
+                     ("diels_alder", "DATS_rct.out", "DATS.out", "ts", ["15", "15"])]
+
+def synthetic_positions(natoms, seed=0):
+   # Atoms on a jittered cubic lattice with 1.5 Angstrom spacing (C, C, H, C, C, H, ...)
+   side = int(math.ceil(natoms ** (1.0 / 3.0)))
+   grid = np.array([(i, j, k) for i in range(side) for j in range(side) for k in range(side)][:natoms], dtype=float)
+   rng = np.random.RandomState(seed)
+   coordinates = 1.5 * grid + rng.uniform(-0.1, 0.1, grid.shape)
+   coordinates -= coordinates.mean(axis=0)
+   elements = ['H' if i % 3 == 2 else 'C' for i in range(natoms)]
+   return elements, coordinates
+
+def synthetic_hessian(coordinates, ts=False):
+   # Cartesian force constants (Hartree/Bohr^2) of a network of central springs between
+   # lattice neighbours and next-nearest neighbours, which is rigid and has exactly six
+   # zero modes. A transition structure gets one strongly negative spring, giving one
+   # imaginary mode (a rank-one perturbation cannot give more)
+   natoms = len(coordinates)
+   hessian = np.zeros((3 * natoms, 3 * natoms))
+   for i in range(natoms):
+      for j in range(i + 1, natoms):
+         vector = coordinates[j] - coordinates[i]
+         distance = np.linalg.norm(vector)
+         if distance > 2.4: continue
+         k = 0.4 if distance < 1.8 else 0.05
+         if ts and i == 0 and j == 1: k = -2.0
+         block = k * np.outer(vector, vector) / distance ** 2
+         hessian[3*i:3*i+3, 3*i:3*i+3] += block
+         hessian[3*j:3*j+3, 3*j:3*j+3] += block
+         hessian[3*i:3*i+3, 3*j:3*j+3] -= block
+         hessian[3*j:3*j+3, 3*i:3*i+3] -= block
+   return hessian
+
+def write_synthetic_output(file, natoms, ts=False, seed=0):
+   """
+   Writes a minimal Gaussian-style frequency output for natoms atoms: the mass table,
+   rotational constants and an archive block with coordinates and the packed
+   force constants, which is everything Kinisot reads from a real log
+   """
+   elements, coordinates = synthetic_positions(natoms, seed)
+   masses = np.array([1.00783 if element == 'H' else 12.00000 for element in elements])
+   hessian = synthetic_hessian(coordinates, ts)
+
+   # Rotational constants (GHz), largest first as Gaussian prints them
+   rot_constants = rotational_constants(coordinates, masses)
+
+   formula = "C%dH%d" % (elements.count('C'), elements.count('H'))
+   atoms = "\\".join("%s,%.6f,%.6f,%.6f" % (element, x, y, z) for element, (x, y, z) in zip(elements, coordinates))
+   packed = ",".join("%.7f" % value for value in hessian[np.tril_indices(3 * natoms)])
+   archive = ("1\\1\\GINC-SYNTHETIC\\Freq\\RB3LYP\\6-31G(d)\\" + formula + "\\KINISOT\\01-Jan-2000\\0\\\\"
+              "#P B3LYP/6-31G(d) freq\\\\synthetic " + str(natoms) + " atom benchmark\\\\0,1\\" + atoms +
+              "\\\\Version=Synthetic\\State=1-A\\HF=-" + str(38.0 * natoms) + "\\PG=C01 [X(" + formula + ")]\\NImag=" +
+              ("1" if ts else "0") + "\\\\" + packed + "\\\\" + ",".join(["0."] * 3 * natoms) + "\\\\\\@")
+
+   with open(file, 'w') as output:
+      output.write(" Entering Gaussian System, synthetic benchmark input\n")
+      for i, (element, mass) in enumerate(zip(elements, masses)):
+         output.write(" Atom %5d has atomic number %2d and mass %10.5f\n" % (i + 1, 1 if element == 'H' else 6, mass))
+      output.write(" Rotational constants (GHZ):" + "".join("%17.5f" % c for c in rot_constants) + "\n")
+      # archive lines are wrapped at 70 columns, as Gaussian does
+      for first in range(0, len(archive), 70): output.write(" " + archive[first:first + 70] + "\n")
+      output.write("\n Normal termination of Gaussian\n")
+   return file
+
+def write_fchk(structure, file):
+   """
+   Writes a parsed Structure as a Gaussian formatted checkpoint file, with the
+   sections Kinisot reads from one (atoms, atomic weights, coordinates in Bohr,
+   SCF energy and the packed Cartesian force constants)
+   """
+   def array(name, kind, values):
+      per_line, form = (6, "%12d") if kind == "I" else (5, "%16.8E")
+      lines = ["%-40s   %s   N=%12d" % (name, kind, len(values))]
+      for first in range(0, len(values), per_line):
+         lines.append("".join(form % value for value in values[first:first + per_line]))
+      return lines
+
+   method, basis = (structure.level or "unknown/unknown").split("/", 1)
+   lines = [os.path.basename(file), "%-10s%-30s%-30s" % ("Freq", method, basis), "%-40s   I     %12d" % ("Number of atoms", structure.natoms)]
+   if structure.scf_energy is not None: lines.append("%-40s   R     %22.15E" % ("SCF Energy", structure.scf_energy))
+   lines += array("Real atomic weights", "R", structure.masses)
+   if structure.coordinates is not None: lines += array("Current cartesian coordinates", "R", structure.coordinates.ravel() / BOHR_TO_ANGSTROM)
+   lines += array("Cartesian Force Constants", "R", structure.force_constants)
+   with open(file, 'w') as fchk: fchk.write("\n".join(lines) + "\n")
+   return file
+
+def time_call(function, repeat=3):
+   # Wall-clock seconds of each of repeat calls. The eigenvalue memo is emptied before
+   # each one, so that every call diagonalizes as it would in a fresh run
+   times = []
+   for _ in range(repeat):
+      eigenvalue_memo.clear()
+      start = time.perf_counter()
+      function()
+      times.append(time.perf_counter() - start)
+   return times
+
+def peak_memory(function):
+   # Peak bytes allocated during one call, as traced by tracemalloc (which sees NumPy
+   # arrays, but not the scratch space LAPACK allocates inside eigvalsh), from an empty eigenvalue memo
+   eigenvalue_memo.clear()
+   tracemalloc.start()
+   try:
+      function()
+      return tracemalloc.get_traced_memory()[1]
+   finally:
+      tracemalloc.stop()
+
+def benchmark_cases(directory, sizes=BENCHMARK_SIZES):
+   """
+   The benchmarks as a list of (name, function) pairs, named "stage[input]". Synthetic
+   outputs of each size in sizes are written to directory. Parsing stages (read_hess,
+   level_of_theory, is_linear and compute_isotope_effect from a filename) include
+   reading the log; assembly, diagonalization and calc_rpfr use parsed Structures
+   """
+   reactions = [(name, os.path.join(EXAMPLES_DIR, rct), os.path.join(EXAMPLES_DIR, other), kind, labels)
+                for name, rct, other, kind, labels in EXAMPLE_REACTIONS]
+   for natoms in sizes:
+      gs = write_synthetic_output(os.path.join(directory, "synthetic_%d_gs.out" % natoms), natoms)
+      ts = write_synthetic_output(os.path.join(directory, "synthetic_%d_ts.out" % natoms), natoms, ts=True)
+      reactions.append(("synthetic_%d" % natoms, gs, ts, "ts", ["3", "3"]))
+
+   cases, seen = [], set()
+   for name, rct, other, kind, labels in reactions:
+      for file, label in zip([rct, other], labels):
+         key = os.path.splitext(os.path.basename(file))[0]
+         if key in seen: continue
+         seen.add(key)
+         structure = Structure(file)
+         hessian = read_hess(structure, label)
+         fchk = write_fchk(structure, os.path.join(directory, key + ".fchk"))
+         cases += [("parse[%s]" % key, lambda file=file: Structure(file)),
+                   ("parse_fchk[%s]" % key, lambda fchk=fchk: Structure(fchk)),
+                   ("read_hess[%s]" % key, lambda file=file, label=label: read_hess(file, label)),
+                   ("assemble[%s]" % key, lambda structure=structure, label=label: read_hess(structure, label)),
+                   ("level_of_theory[%s]" % key, lambda file=file: level_of_theory(file)),
+                   ("is_linear[%s]" % key, lambda file=file: is_linear(file)),
+                   ("diagonalize[%s]" % key, lambda hessian=hessian: calc_eigenvalues(hessian)),
+                   ("calc_rpfr[%s]" % key, lambda structure=structure, label=label: calc_rpfr([structure], [label]))]
+      # the full pipeline from filenames
+      if kind == "ts": args = ([rct], [other], None, labels)
+      else: args = ([rct], None, [other], labels)
+      cases.append(("compute_isotope_effect[%s]" % name, lambda args=args: compute_isotope_effect(*args)))
+   return cases
+
+# Radii (Angstrom) of the cutoff models compared with the full isotope effects
+TRUNCATION_RADII = [3.0, 4.0, 5.0, 6.0]
+
+def truncation_report(radii=TRUNCATION_RADII, sizes=[200, 500], log=None):
+   """
+   How far cutoff models (cutoff_model) of each radius deviate from the full
+   isotope effect, and how much faster they are, for the bundled examples and
+   synthetic outputs of each size in sizes. Returns one dict per reaction and
+   radius with the atoms kept, both KIEs (without tunnelling), the deviation
+   of the cutoff KIE relative to the full KIE and to the full isotope effect
+   KIE - 1, and the seconds taken by each calculation (excluding parsing)
+   """
+   directory = tempfile.mkdtemp(prefix="kinisot-bench-")
+   try:
+      reactions = [(name, os.path.join(EXAMPLES_DIR, rct), os.path.join(EXAMPLES_DIR, other), kind, labels)
+                   for name, rct, other, kind, labels in EXAMPLE_REACTIONS]
+      for natoms in sizes:
+         gs = write_synthetic_output(os.path.join(directory, "synthetic_%d_gs.out" % natoms), natoms)
+         ts = write_synthetic_output(os.path.join(directory, "synthetic_%d_ts.out" % natoms), natoms, ts=True)
+         reactions.append(("synthetic_%d" % natoms, gs, ts, "ts", ["3", "3"]))
+
+      rows = []
+      for name, rct, other, kind, labels in reactions:
+         structures = [Structure(rct), Structure(other)]
+         def kie(structures, labels):
+            # without memoized eigenvalues from an earlier call
+            eigenvalue_memo.clear()
+            start = time.perf_counter()
+            if kind == "ts": values = compute_isotope_effect(structures[:1], structures[1:], None, labels)
+            else: values = compute_isotope_effect(structures[:1], None, structures[1:], labels)
+            return values[4], time.perf_counter() - start
+         kie(structures, labels) # warm-up: the worker threads are started on first use
+         full, full_seconds = kie(structures, labels)
+         for radius in radii:
+            models, model_labels = cutoff_model(structures, labels, radius)
+            cutoff, seconds = kie(models, model_labels)
+            rows.append({"reaction": name, "radius": radius, "atoms": [model.natoms for model in models],
+                         "natoms": [structure.natoms for structure in structures], "KIE": full, "cutoff-KIE": cutoff,
+                         "deviation": cutoff / full - 1.0, "effect-deviation": (cutoff - full) / (full - 1.0),
+                         "seconds": full_seconds, "cutoff-seconds": seconds})
+            if log: log("   %-24s %5.1f A %9s %10.6f %10.6f %+10.2e %+9.2f%% %8.1fx\n" % (name, radius, "%d/%d" % tuple(rows[-1]["atoms"]),
+                        full, cutoff, rows[-1]["deviation"], 100 * rows[-1]["effect-deviation"], full_seconds / max(seconds, 1e-9)))
+   finally:
+      shutil.rmtree(directory, ignore_errors=True)
+   return rows
+
+def git_commit():
+   # The checked-out commit of the source tree, if it is a git repository
+   try:
+      return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                     stderr=subprocess.DEVNULL).decode().strip()
+   except (OSError, subprocess.CalledProcessError):
+      return None
+
+def run_benchmarks(sizes=BENCHMARK_SIZES, repeat=3, match=None, log=None):
+   """
+   Times every benchmark whose name contains match (all by default) repeat times and
+   returns a JSON-serializable dict of the run: the environment, and for each
+   benchmark the best and median wall-clock time in seconds and the peak memory
+   allocated by one further call
+   """
+   directory = tempfile.mkdtemp(prefix="kinisot-bench-")
+   try:
+      results = {}
+      for name, function in benchmark_cases(directory, sizes):
+         if match and match not in name: continue
+         times = sorted(time_call(function, repeat))
+         results[name] = {"best": times[0], "median": times[len(times) // 2], "runs": len(times),
+                          "peak_bytes": peak_memory(function)}
+         if log: log("   %-50s %12.6f s %10.2f MB\n" % (name, times[0], results[name]["peak_bytes"] / 1024.0**2))
+   finally:
+      shutil.rmtree(directory, ignore_errors=True)
+   return {"format": BENCHMARK_FORMAT, "commit": git_commit(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+           "python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+           "sizes": list(sizes), "repeat": repeat, "results": results}
+
+def compare_benchmarks(base, new, threshold=0.10):
+   """
+   Compares two runs from run_benchmarks by their best times and peak memory.
+   Returns a list of (name, base seconds, new seconds, ratio, slower, memory ratio,
+   more memory) for the benchmarks in both, where slower and more memory flag a
+   ratio new/base above 1 + threshold. The memory ratio is None for runs that
+   did not record peak memory
+   """
+   rows = []
+   for name in base["results"]:
+      if name not in new["results"]: continue
+      old, now = base["results"][name], new["results"][name]
+      ratio = now["best"] / old["best"] if old["best"] > 0 else float('inf')
+      memory = None
+      if old.get("peak_bytes") and now.get("peak_bytes") is not None: memory = now["peak_bytes"] / float(old["peak_bytes"])
+      rows.append((name, old["best"], now["best"], ratio, ratio > 1.0 + threshold, memory, memory is not None and memory > 1.0 + threshold))
+   return rows
+
+def bench_main(argv=None):
+   # python -m kinisot bench [-o results.json]; python -m kinisot bench compare base.json new.json
+   # python -m kinisot bench truncation [--radii 3 4 5 6]
+   if argv and argv[0] == "truncation":
+      parser = ArgumentParser(prog="kinisot bench truncation", description="Compare cutoff-model isotope effects with the full ones")
+      parser.add_argument("--radii", dest="radii", type=float, nargs="+", default=TRUNCATION_RADII, help="cutoff radii in Angstrom (default 3 4 5 6)")
+      parser.add_argument("--sizes", dest="sizes", type=int, nargs="*", default=[200, 500], help="atoms in the synthetic outputs (default 200 500)")
+      parser.add_argument("-o", dest="output", default=None, help="also write the comparison as JSON")
+      options = parser.parse_args(argv[1:])
+      print("   %-24s %7s %9s %10s %10s %10s %10s %9s" % ("reaction", "radius", "atoms", "KIE", "cutoff-KIE", "deviation", "of KIE-1", "speedup"))
+      rows = truncation_report(options.radii, options.sizes, log=sys.stdout.write)
+      if options.output:
+         with open(options.output, 'w') as f: json.dump(rows, f, indent=1)
+      return 0
+
+   if argv and argv[0] == "compare":
+      parser = ArgumentParser(prog="kinisot bench compare", description="Compare two benchmark runs and flag slowdowns")
+      parser.add_argument("base", help="JSON from an earlier run")
+      parser.add_argument("new", help="JSON from the run to check")
+      parser.add_argument("--threshold", dest="threshold", type=float, default=0.10, help="relative slowdown to flag (default 0.10)")
+      options = parser.parse_args(argv[1:])
+      with open(options.base) as f: base = json.load(f)
+      with open(options.new) as f: new = json.load(f)
+
+      rows = compare_benchmarks(base, new, options.threshold)
+      print("    %-50s %12s %12s %8s %8s" % ("benchmark", "base/s", "new/s", "ratio", "memory"))
+      for name, before, after, ratio, slower, memory, more_memory in rows:
+         print("%s%s  %-50s %12.6f %12.6f %8.3f %8s" % ("!" if slower else " ", "m" if more_memory else " ", name, before, after, ratio,
+                                                       "" if memory is None else "%.3f" % memory))
+      slowdowns = [row for row in rows if row[4]]
+      growths = [row for row in rows if row[6]]
+      missing = sorted(set(base["results"]) - set(new["results"]))
+      if missing: print("\no  %d benchmarks of %s were not run in %s" % (len(missing), options.base, options.new))
+      print("\no  %d of %d benchmarks slower than base by more than %.0f%%" % (len(slowdowns), len(rows), 100 * options.threshold))
+      print("o  %d of %d benchmarks use more memory than base by more than %.0f%%" % (len(growths), len(rows), 100 * options.threshold))
+      return 1 if slowdowns or growths else 0
+
+   parser = ArgumentParser(prog="kinisot bench", description="Time the parsing, assembly, diagonalization and KIE pipelines")
+   parser.add_argument("--sizes", dest="sizes", type=int, nargs="+", default=BENCHMARK_SIZES, help="atoms in the synthetic outputs (default 50 200 500)")
+   parser.add_argument("--repeat", dest="repeat", type=int, default=3, help="timed calls of each benchmark (default 3)")
+   parser.add_argument("--match", dest="match", default=None, help="only run benchmarks whose name contains this string")
+   parser.add_argument("-o", dest="output", default=None, help="JSON file for the results (default: standard output)")
+   options = parser.parse_args(argv)
+
+   results = run_benchmarks(options.sizes, options.repeat, options.match, log=sys.stderr.write)
+   if options.output:
+      with open(options.output, 'w') as f: json.dump(results, f, indent=1)
+   else:
+      json.dump(results, sys.stdout, indent=1); print()
+   return 0
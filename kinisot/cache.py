@@ -0,0 +1,208 @@
+#!/usr/bin/python
+
+# Comments and/or additions are welcome (send e-mail to:
+# robert.paton@colostate.edu
+
+import os, hashlib, tempfile, threading
+from collections import OrderedDict
+import numpy as np
+
+# Importing regardless of relative import
+try:
+    from .Hess_to_Freq import Structure, PARSER_VERSION, content_hash
+    from . import profiling
+except:
+    from Hess_to_Freq import Structure, PARSER_VERSION, content_hash
+    import profiling
+
+class HessianCache:
+   # An opt-in on-disk cache of parsed Gaussian outputs and of isotopologue eigenvalues.
+   # Parsed data (masses, packed force constants, rotational constants, level of theory)
+   # are stored as .npz files keyed by the SHA-256 of the output file and PARSER_VERSION,
+   # so an unchanged log is never parsed twice. Eigenvalues are stored as .npy files
+   # keyed by the same hash and the isotopologue mass vector. Least-recently used files
+   # are evicted once the directory grows beyond max_bytes.
+   def __init__(self, directory, max_bytes=512 * 1024**2):
+      self.directory, self.max_bytes = directory, max_bytes
+      self.hits, self.misses = 0, 0
+      if not os.path.isdir(directory): os.makedirs(directory)
+      # bytes in the directory as of the last eviction plus what has been written since
+      self.nbytes, self.lock = None, threading.Lock()
+      # eigenvalue files read or written by this process
+      self.stored = set()
+
+   def _path(self, name):
+      return os.path.join(self.directory, name)
+
+   def _read(self, path):
+      # Touch the entry so that eviction sees it as recently used
+      try: os.utime(path)
+      except OSError: return False
+      return True
+
+   @profiling.timed("cache write")
+   def _write(self, path, save, *args, **kwargs):
+      # Write to a unique temporary name then rename, so readers never see a partial entry
+      # and threads or processes writing the same entry do not collide
+      fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+      try:
+         with os.fdopen(fd, 'wb') as f: save(f, *args, **kwargs)
+         size = os.path.getsize(tmp)
+         os.replace(tmp, path)
+      except BaseException:
+         if os.path.exists(tmp): os.remove(tmp)
+         raise
+      # the directory is only listed once the running total exceeds max_bytes
+      with self.lock:
+         if self.nbytes is not None: self.nbytes += size
+      if self.nbytes is None or self.nbytes > self.max_bytes: self.evict()
+
+   @profiling.timed("cache read")
+   def load(self, file):
+      # The Structure for an output file: read back from the cache when the contents
+      # are unchanged, otherwise parsed from the text and stored
+      digest = content_hash(file)
+      path = self._path("%s-p%d.npz" % (digest, PARSER_VERSION))
+      if self._read(path):
+         try:
+            with np.load(path) as data:
+               rot_constants = list(data['rot_constants']) if data['has_rot'] else None
+               level = str(data['level']) or None
+               coordinates = data['coordinates'] if data['coordinates'].size else None
+               scf_energy = float(data['scf_energy']) if not np.isnan(data['scf_energy']) else None
+               structure = Structure.from_arrays(file, int(data['natoms']), data['masses'], data['force_constants'],
+                                                 rot_constants, level, digest, coordinates, scf_energy)
+            self.hits += 1; profiling.count("cache hits")
+         except (OSError, ValueError, KeyError): structure = None
+      else: structure = None
+
+      if structure is None:
+         self.misses += 1; profiling.count("cache misses")
+         structure = Structure(file)
+         structure._digest = digest
+         self._write(path, np.savez, natoms=structure.natoms, masses=structure.masses,
+                     force_constants=structure.force_constants, has_rot=structure.rot_constants is not None,
+                     rot_constants=np.array(structure.rot_constants or [], dtype=float),
+                     level=structure.level or "",
+                     coordinates=structure.coordinates if structure.coordinates is not None else np.zeros((0, 3)),
+                     scf_energy=structure.scf_energy if structure.scf_energy is not None else np.nan)
+      structure.cache = self
+      return structure
+
+   def _eigenvalue_path(self, structure, masses):
+      masses_key = hashlib.sha256(np.ascontiguousarray(masses, dtype=float).tobytes()).hexdigest()[:16]
+      return self._path("%s-p%d-%s.npy" % (structure.digest, PARSER_VERSION, masses_key))
+
+   @profiling.timed("cache read")
+   def load_eigenvalues(self, structure, masses):
+      # Eigenvalues stored for this structure and isotopologue mass vector, or None
+      path = self._eigenvalue_path(structure, masses)
+      if self._read(path):
+         try:
+            eigenvalues = np.load(path)
+            self.hits += 1; profiling.count("cache hits")
+            self.stored.add(path)
+            return eigenvalues
+         except (OSError, ValueError): pass
+      self.misses += 1; profiling.count("cache misses")
+      return None
+
+   def save_eigenvalues(self, structure, masses, eigenvalues):
+      path = self._eigenvalue_path(structure, masses)
+      self._write(path, np.save, np.asarray(eigenvalues))
+      self.stored.add(path)
+
+   def keep_eigenvalues(self, structure, masses, eigenvalues):
+      # Stores eigenvalues found elsewhere (in Kinisot.eigenvalue_memo) unless the cache has
+      # them; only the first call for an entry not read or written by this process checks
+      path = self._eigenvalue_path(structure, masses)
+      if path in self.stored: return
+      if os.path.exists(path): self.stored.add(path)
+      else: self.save_eigenvalues(structure, masses, eigenvalues)
+
+   def evict(self):
+      # Remove the least recently used entries until the cache fits in max_bytes
+      entries, total = [], 0
+      for name in os.listdir(self.directory):
+         if not (name.endswith('.npz') or name.endswith('.npy')): continue
+         try: stat = os.stat(self._path(name))
+         except OSError: continue
+         entries.append((stat.st_mtime, stat.st_size, name))
+         total += stat.st_size
+      for mtime, size, name in sorted(entries):
+         if total <= self.max_bytes: break
+         try: os.remove(self._path(name))
+         except OSError: continue
+         total -= size
+      with self.lock: self.nbytes = total
+
+class MemoryCache:
+   # Parsed Structures and their isotopologue eigenvalues kept in memory by a long-running
+   # process (kinisot serve), with the same interface as HessianCache. A file is parsed
+   # again when its size or modification time changes, and the least recently used
+   # structures are dropped, together with their eigenvalues, once they hold more than
+   # max_bytes. An optional HessianCache is consulted before parsing or diagonalizing.
+
+   # The eigenvalues of these structures are kept here rather than in Kinisot.eigenvalue_memo,
+   # so that they count towards max_bytes (see calc_isotopologue_eigenvalues)
+   resident = True
+
+   def __init__(self, max_bytes=1024**3, disk=None):
+      self.max_bytes, self.disk = max_bytes, disk
+      self.hits, self.misses = 0, 0
+      # absolute path -> [(mtime, size), Structure, {masses: eigenvalues}, bytes held]
+      self.entries, self.nbytes = OrderedDict(), 0
+
+   def _entry(self, structure):
+      entry = self.entries.get(os.path.abspath(structure.file))
+      if entry is None or entry[1] is not structure: return None
+      return entry
+
+   def load(self, file):
+      path = os.path.abspath(file)
+      stat = os.stat(path)
+      stamp = (stat.st_mtime_ns, stat.st_size)
+      entry = self.entries.get(path)
+      if entry is not None and entry[0] == stamp:
+         self.entries.move_to_end(path)
+         self.hits += 1; profiling.count("cache hits")
+         return entry[1]
+      if entry is not None: self.nbytes -= self.entries.pop(path)[3]
+
+      self.misses += 1; profiling.count("cache misses")
+      structure = self.disk.load(file) if self.disk is not None else Structure(file)
+      structure.cache = self
+      size = structure.masses.nbytes + structure.force_constants.nbytes
+      self.entries[path] = [stamp, structure, {}, size]
+      self.nbytes += size
+      self.evict()
+      return structure
+
+   def load_eigenvalues(self, structure, masses):
+      entry = self._entry(structure)
+      key = np.ascontiguousarray(masses, dtype=float).tobytes()
+      if entry is not None and key in entry[2]:
+         self.hits += 1; profiling.count("cache hits")
+         return entry[2][key]
+      eigenvalues = self.disk.load_eigenvalues(structure, masses) if self.disk is not None else None
+      if eigenvalues is None:
+         self.misses += 1; profiling.count("cache misses")
+      elif entry is not None: self._store(entry, key, eigenvalues)
+      return eigenvalues
+
+   def save_eigenvalues(self, structure, masses, eigenvalues):
+      entry = self._entry(structure)
+      if entry is not None: self._store(entry, np.ascontiguousarray(masses, dtype=float).tobytes(), np.asarray(eigenvalues))
+      if self.disk is not None: self.disk.save_eigenvalues(structure, masses, eigenvalues)
+
+   def _store(self, entry, key, eigenvalues):
+      if key not in entry[2]:
+         entry[3] += eigenvalues.nbytes; self.nbytes += eigenvalues.nbytes
+      entry[2][key] = eigenvalues
+      self.evict()
+
+   def evict(self):
+      # Drop the least recently used structures, keeping at least the latest one
+      while self.nbytes > self.max_bytes and len(self.entries) > 1:
+         path, entry = self.entries.popitem(last=False)
+         self.nbytes -= entry[3]
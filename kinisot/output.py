@@ -0,0 +1,65 @@
+#!/usr/bin/python
+
+# Comments and/or additions are welcome (send e-mail to:
+# robert.paton@colostate.edu
+
+import io, csv, json, math
+import numpy as np
+
+# Importing regardless of relative import
+try:
+    from .Kinisot import RESULT_COLUMNS, FREQUENCY_COLUMNS
+except:
+    from Kinisot import RESULT_COLUMNS, FREQUENCY_COLUMNS
+
+# Machine-readable result formats, and their columns: the isotopic labels (one per
+# species, separated by ';' as in a batch manifest), temperature, vibrational scaling
+# factor, the printed isotope effect terms and the TS imaginary frequencies in cm-1
+OUTPUT_FORMATS = ["csv", "jsonl", "npz"]
+OUTPUT_COLUMNS = ["iso", "T", "scale"] + RESULT_COLUMNS + FREQUENCY_COLUMNS
+
+class ResultWriter:
+   # Writes result rows (dicts with the OUTPUT_COLUMNS keys) as CSV, JSON-lines or a
+   # NumPy .npz archive with one array per column. Text is written through a large
+   # buffer; the columns of an .npz are collected in memory and saved on close
+   def __init__(self, path, format="csv", buffer_size=1 << 20):
+      if format not in OUTPUT_FORMATS: raise ValueError("Unknown output format " + str(format) + "!")
+      self.path, self.format, self.rows = path, format, 0
+      if format == "npz":
+         self.columns = dict((column, []) for column in OUTPUT_COLUMNS)
+      else:
+         self.out = io.open(path, 'w', buffering=buffer_size, newline='')
+         if format == "csv":
+            self.writer = csv.writer(self.out)
+            self.writer.writerow(OUTPUT_COLUMNS)
+
+   def write(self, row):
+      values = [row.get(column) for column in OUTPUT_COLUMNS]
+      values = [float(value) if isinstance(value, (float, np.floating)) else value for value in values]
+      if self.format == "csv":
+         self.writer.writerow(["" if value is None else value for value in values])
+      elif self.format == "jsonl":
+         # NaN (e.g. no imaginary frequency for an EQE) is not valid JSON: write null
+         values = [None if isinstance(value, float) and math.isnan(value) else value for value in values]
+         self.out.write(json.dumps(dict(zip(OUTPUT_COLUMNS, values))) + "\n")
+      else:
+         for column, value in zip(OUTPUT_COLUMNS, values): self.columns[column].append(value)
+      self.rows += 1
+
+   def write_rows(self, rows):
+      for row in rows: self.write(row)
+
+   def close(self):
+      if self.format == "npz":
+         arrays = dict((column, np.array(["" if v is None else v for v in values], dtype=str) if column == "iso"
+                        else np.array([np.nan if v is None else v for v in values], dtype=float))
+                       for column, values in self.columns.items())
+         with open(self.path, 'wb') as f: np.savez(f, **arrays)
+      else: self.out.close()
+
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *exc):
+      self.close()
+      return False
@@ -0,0 +1,109 @@
+#!/usr/bin/python
+
+# Comments and/or additions are welcome (send e-mail to:
+# robert.paton@colostate.edu
+
+import time, threading, functools
+
+# Lightweight instrumentation: named timers and counters recorded by hooks in
+# Hess_to_Freq and Kinisot. Nothing is recorded unless enable() has been called,
+# and a disabled hook costs one check of this flag
+enabled = False
+
+# name -> [calls, inclusive seconds, exclusive seconds] and name -> count, shared by
+# every thread and only updated under _lock
+timers, counters = {}, {}
+_lock = threading.Lock()
+
+# The timers running in each thread, innermost last: [name, start, seconds in nested timers]
+_local = threading.local()
+
+def enable():
+   global enabled
+   enabled = True
+
+def disable():
+   global enabled
+   enabled = False
+
+def reset():
+   with _lock: timers.clear(); counters.clear()
+
+class _Timer:
+   # Times a block as the phase name. Time spent in timers nested inside it is
+   # excluded from its exclusive seconds, so the phases of a run add up to its total
+   __slots__ = ('name',)
+
+   def __init__(self, name):
+      self.name = name
+
+   def __enter__(self):
+      stack = getattr(_local, 'stack', None)
+      if stack is None: stack = _local.stack = []
+      stack.append([self.name, time.perf_counter(), 0.0])
+      return self
+
+   def __exit__(self, *exc):
+      stack = _local.stack
+      name, start, nested = stack.pop()
+      elapsed = time.perf_counter() - start
+      with _lock:
+         entry = timers.setdefault(name, [0, 0.0, 0.0])
+         entry[0] += 1; entry[1] += elapsed; entry[2] += elapsed - nested
+      if stack: stack[-1][2] += elapsed
+      return False
+
+class _NullTimer:
+   __slots__ = ()
+   def __enter__(self): return self
+   def __exit__(self, *exc): return False
+
+_null_timer = _NullTimer()
+
+def timer(name):
+   # with profiling.timer("eigvalsh"): ...
+   return _Timer(name) if enabled else _null_timer
+
+def timed(name):
+   # Decorator timing every call of a function as the phase name
+   def decorate(function):
+      @functools.wraps(function)
+      def wrapper(*args, **kwargs):
+         if not enabled: return function(*args, **kwargs)
+         with _Timer(name): return function(*args, **kwargs)
+      return wrapper
+   return decorate
+
+def count(name, value=1):
+   # Adds value to the counter name
+   if not enabled: return
+   with _lock: counters[name] = counters.get(name, 0) + value
+
+def report(total=None):
+   """
+   The recorded timers and counters as a JSON-serializable dict. Phases are sorted
+   by exclusive time; with the total wall-clock time of the run, the time outside
+   every phase is reported as "other"
+   """
+   with _lock:
+      phases = [{"phase": name, "calls": calls, "seconds": exclusive, "inclusive": inclusive}
+                for name, (calls, inclusive, exclusive) in timers.items()]
+      result = {"phases": phases, "counters": dict(sorted(counters.items()))}
+   phases.sort(key=lambda phase: -phase["seconds"])
+   if total is not None:
+      result["total"] = total
+      result["other"] = max(0.0, total - sum(phase["seconds"] for phase in phases))
+   return result
+
+def format_report(result):
+   # The report as text lines for the Kinisot log
+   lines = ["   {:<32} {:>8} {:>12} {:>8}".format("phase", "calls", "seconds", "%")]
+   total = result.get("total") or sum(phase["seconds"] for phase in result["phases"]) or 1.0
+   rows = [(phase["phase"], phase["calls"], phase["seconds"]) for phase in result["phases"]]
+   if "other" in result: rows.append(("other", "", result["other"]))
+   for name, calls, seconds in rows:
+      lines.append("   {:<32} {:>8} {:>12.6f} {:>8.1f}".format(name, calls, seconds, 100.0 * seconds / total))
+   if "total" in result: lines.append("   {:<32} {:>8} {:>12.6f}".format("total", "", result["total"]))
+   for name, value in result["counters"].items():
+      lines.append("   {:<32} {:>21}".format(name, value))
+   return lines
@@ -0,0 +1,109 @@
+#!/usr/bin/python
+
+# Comments and/or additions are welcome (send e-mail to:
+# robert.paton@colostate.edu
+
+import os, sys, json, stat, time, socket, threading
+from argparse import ArgumentParser
+
+# Importing regardless of relative import
+try:
+    from .batch import normalize_job, run_job
+    from .cache import MemoryCache, HessianCache
+except:
+    from batch import normalize_job, run_job
+    from cache import MemoryCache, HessianCache
+
+def handle_request(request, cache):
+   """
+   Answers one request: a JSON object with the manifest keys of a batch job (rct,
+   ts or prd, iso, T, scale, cutoff) and an optional id that is echoed back, or
+   {"cmd": "stats"} for the state of the cache. Structures and eigenvalues are
+   taken from the MemoryCache, so repeated queries about the same logs skip the
+   parsing and diagonalization. Returns the response as a dict
+   """
+   start = time.perf_counter()
+   try:
+      if not isinstance(request, dict): raise ValueError("A request must be a JSON object")
+      if request.get("cmd") == "stats":
+         response = {"ok": True, "structures": len(cache.entries), "bytes": cache.nbytes,
+                     "hits": cache.hits, "misses": cache.misses}
+      else:
+         response = run_job(normalize_job(request), {}, cache)
+         response["ok"] = "error" not in response
+   except Exception as e:
+      # a malformed request must not take down the server
+      response = {"ok": False, "error": str(e) if isinstance(e, ValueError) else type(e).__name__ + ": " + str(e)}
+   if isinstance(request, dict) and "id" in request: response["id"] = request["id"]
+   response["seconds"] = time.perf_counter() - start
+   return response
+
+def handle_line(line, cache):
+   # A JSON-lines request as its JSON response (without the newline)
+   try: request = json.loads(line)
+   except ValueError as e: return json.dumps({"ok": False, "error": "Invalid JSON: " + str(e)})
+   return json.dumps(handle_request(request, cache))
+
+def serve_stream(lines, out, cache):
+   # Answers JSON-lines requests, e.g. from standard input, until the end of the input
+   for line in lines:
+      if not line.strip(): continue
+      out.write(handle_line(line, cache) + "\n")
+      out.flush()
+
+def serve_socket(path, cache, ready=None):
+   """
+   Listens on a Unix socket at path. Each connection can send any number of
+   JSON-lines requests and receives one response line for each. Connections are
+   served in threads; requests are computed one at a time
+   """
+   import socketserver
+   lock = threading.Lock()
+
+   class Handler(socketserver.StreamRequestHandler):
+      def handle(self):
+         for line in self.rfile:
+            if not line.strip(): continue
+            with lock: response = handle_line(line.decode('utf-8'), cache)
+            self.wfile.write((response + "\n").encode('utf-8'))
+            self.wfile.flush()
+
+   # a socket left behind by an earlier server is replaced, but no other file is touched
+   if os.path.lexists(path):
+      if not is_socket(path): raise ValueError(path + " exists and is not a socket!")
+      os.remove(path)
+   server = socketserver.ThreadingUnixStreamServer(path, Handler)
+   server.daemon_threads = True
+   if ready is not None: ready(server)
+   try:
+      server.serve_forever()
+   finally:
+      server.server_close()
+      if is_socket(path): os.remove(path)
+
+def is_socket(path):
+   # Whether path itself (not a file it links to) is a Unix socket
+   try: return stat.S_ISSOCK(os.lstat(path).st_mode)
+   except OSError: return False
+
+def serve_main(argv=None):
+   # python -m kinisot serve [--socket kinisot.sock] [--memory 1024] [--cache DIR]
+   parser = ArgumentParser(prog="kinisot serve", description="Answer isotope effect queries from JSON-lines on standard input or a Unix socket")
+   parser.add_argument("--socket", dest="socket", default=None, help="Unix socket to listen on (default: read standard input)")
+   parser.add_argument("--memory", dest="memory", type=float, default=1024.0, help="memory for resident structures and eigenvalues in MB (default 1024)")
+   parser.add_argument("--cache", dest="cache", default=None, help="directory of an on-disk cache to use behind the resident structures")
+   parser.add_argument("--cache-size", dest="cache_size", type=float, default=512.0, help="maximum size of the cache directory in MB (default 512)")
+   options = parser.parse_args(argv)
+
+   disk = HessianCache(options.cache, int(options.cache_size * 1024**2)) if options.cache != None else None
+   cache = MemoryCache(int(options.memory * 1024**2), disk)
+   if options.socket == None:
+      serve_stream(sys.stdin, sys.stdout, cache)
+   elif not hasattr(socket, "AF_UNIX"):
+      print("o  Unix sockets are not available on this platform: omit --socket to serve standard input"); return 1
+   else:
+      try: serve_socket(options.socket, cache)
+      except ValueError as e:
+         print("o  " + str(e)); return 1
+      except KeyboardInterrupt: pass
+   return 0
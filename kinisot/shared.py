@@ -0,0 +1,96 @@
+#!/usr/bin/python
+
+# Comments and/or additions are welcome (send e-mail to:
+# robert.paton@colostate.edu
+
+import numpy as np
+from multiprocessing import shared_memory
+
+# Importing regardless of relative import
+try:
+    from .Hess_to_Freq import Structure
+    from . import profiling
+except:
+    from Hess_to_Freq import Structure
+    import profiling
+
+# The arrays of a Structure placed in its shared memory segment, in this order
+SHARED_ARRAYS = ["masses", "force_constants", "coordinates"]
+
+class SharedStructures:
+   # Parsed Structures published to worker processes through multiprocessing.shared_memory.
+   # The parent parses each output once and copies its masses, packed force constants and
+   # coordinates into one segment per file; workers map the segments (attach) and build
+   # Structures on zero-copy NumPy views, so that no worker reads or parses the logs again
+   # or holds its own copy of the force constants. The segments are unlinked by close(), or
+   # on leaving a with block, once the workers are done with them.
+   def __init__(self):
+      self.segments, self.descriptors = [], {}
+
+   @profiling.timed("shared memory")
+   def publish(self, parsed):
+      # Copies every Structure of a dict {file: Structure} into shared memory and returns
+      # the picklable descriptors from which attach rebuilds them
+      for file, structure in parsed.items():
+         arrays = [np.ascontiguousarray(getattr(structure, name), dtype=float) if getattr(structure, name) is not None
+                   else np.zeros((0, 3)) for name in SHARED_ARRAYS]
+         segment = shared_memory.SharedMemory(create=True, size=max(1, sum(array.nbytes for array in arrays)))
+         self.segments.append(segment)
+         layout, offset = [], 0
+         for array in arrays:
+            np.ndarray(array.shape, dtype=float, buffer=segment.buf, offset=offset)[...] = array
+            layout.append((array.shape, offset))
+            offset += array.nbytes
+         self.descriptors[file] = {"segment": segment.name, "layout": layout, "natoms": structure.natoms,
+                                   "rot_constants": structure.rot_constants, "level": structure.level,
+                                   "scf_energy": structure.scf_energy, "key": structure.key,
+                                   "digest": getattr(structure, '_digest', None)}
+      return self.descriptors
+
+   def close(self):
+      # Unlinks every segment; Structures attached to them must no longer be used
+      for segment in self.segments:
+         segment.close()
+         segment.unlink()
+      self.segments, self.descriptors = [], {}
+
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *exc):
+      self.close()
+
+# Segments mapped by this (worker) process, kept open while its Structures are in use
+_attached = {}
+
+def attach(descriptors):
+   """
+   The Structures published by SharedStructures.publish, as a dict {file: Structure}
+   whose masses, force constants and coordinates are read-only views of the shared
+   segments. Each Structure keeps the key of the parsed file, so eigenvalues are
+   memoized as if it had been parsed in this process
+   """
+   structures = {}
+   for file, descriptor in descriptors.items():
+      name = descriptor["segment"]
+      if name not in _attached: _attached[name] = shared_memory.SharedMemory(name=name)
+      arrays = []
+      for shape, offset in descriptor["layout"]:
+         array = np.ndarray(shape, dtype=float, buffer=_attached[name].buf, offset=offset)
+         array.flags.writeable = False
+         arrays.append(array)
+      masses, force_constants, coordinates = arrays
+      structure = Structure.from_arrays(file, descriptor["natoms"], masses, force_constants, descriptor["rot_constants"],
+                                        descriptor["level"], descriptor["digest"], coordinates if coordinates.size else None,
+                                        descriptor["scf_energy"])
+      structure.key = descriptor["key"]
+      structures[file] = structure
+   return structures
+
+def detach():
+   # Unmaps every segment attached by this process. Structures built on them must have
+   # been released first; a segment still in use stays mapped until the process exits
+   for name in list(_attached):
+      try: _attached[name].close()
+      except BufferError: continue
+      del _attached[name]
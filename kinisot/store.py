@@ -0,0 +1,83 @@
+#!/usr/bin/python
+
+# Comments and/or additions are welcome (send e-mail to:
+# robert.paton@colostate.edu
+
+import json, sqlite3, hashlib, threading
+
+# Importing regardless of relative import
+try:
+    from .Kinisot import calc_rpfr, __version__
+    from .Hess_to_Freq import Structure, content_hash
+    from . import profiling
+except:
+    from Kinisot import calc_rpfr, __version__
+    from Hess_to_Freq import Structure, content_hash
+    import profiling
+
+class ResultStore:
+   # An opt-in SQLite database of computed isotope effects, so that an interrupted
+   # campaign resumes where it stopped and a repeated query costs a lookup. A result is
+   # keyed by the SHA-256 of the input files' contents (not their names), the labels,
+   # temperature, vibrational scaling factor, frequency cut-off and Kinisot version,
+   # and stored as the terms of its four RPFRs, from which isotope_effect_from_rpfrs
+   # rebuilds every printed value. Each result is committed as it is recorded, and
+   # several processes may share one database.
+   def __init__(self, path, timeout=60.0):
+      self.path, self.hits, self.misses = path, 0, 0
+      self.lock = threading.Lock()
+      self.connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+      with self.lock, self.connection:
+         self.connection.execute("PRAGMA journal_mode=WAL")
+         self.connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, version TEXT, "
+                                 "inputs TEXT, rpfrs TEXT, created TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+
+   def key(self, rct, second, kind, label, temperature, freq_scale_factor, freq_cutoff):
+      # The key of an isotope effect: kind is "ts" for a KIE and "prd" for an EQE
+      digest = lambda file: file.digest if isinstance(file, Structure) else content_hash(file)
+      inputs = {"rct": [digest(file) for file in rct], kind: [digest(file) for file in second], "iso": list(label),
+                "T": float(temperature), "scale": float(freq_scale_factor), "cutoff": float(freq_cutoff), "version": __version__}
+      return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+
+   @profiling.timed("store read")
+   def get(self, key):
+      # The four RPFRs (reactant, labelled reactant, TS or product, labelled) of a stored result, or None
+      with self.lock:
+         row = self.connection.execute("SELECT rpfrs FROM results WHERE key = ?", (key,)).fetchone()
+      if row is None:
+         self.misses += 1; profiling.count("store misses")
+         return None
+      self.hits += 1; profiling.count("store hits")
+      rpfrs = []
+      for terms in json.loads(row[0]):
+         rpfr = calc_rpfr.__new__(calc_rpfr)
+         rpfr.PF, rpfr.ZPE, rpfr.EXC = terms["PF"], terms["ZPE"], terms["EXC"]
+         if "im_frequency_wn" in terms: rpfr.im_frequency_wn = terms["im_frequency_wn"]
+         rpfrs.append(rpfr)
+      return rpfrs
+
+   @profiling.timed("store write")
+   def put(self, key, KIE, inputs=None):
+      # Records the four RPFRs of a result in a single transaction
+      rpfrs = []
+      for rpfr in KIE:
+         terms = {"PF": float(rpfr.PF), "ZPE": float(rpfr.ZPE), "EXC": float(rpfr.EXC)}
+         if hasattr(rpfr, "im_frequency_wn"): terms["im_frequency_wn"] = float(rpfr.im_frequency_wn)
+         rpfrs.append(terms)
+      with self.lock, self.connection:
+         self.connection.execute("INSERT OR REPLACE INTO results (key, version, inputs, rpfrs) VALUES (?, ?, ?, ?)",
+                                 (key, __version__, json.dumps(inputs), json.dumps(rpfrs)))
+
+   def __len__(self):
+      with self.lock: return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+   def close(self):
+      self.connection.close()
+
+# Stores opened by this (worker) process, by path
+_stores = {}
+
+def open_store(path):
+   # The ResultStore at path, opened once per process
+   if path not in _stores: _stores[path] = ResultStore(path)
+   return _stores[path]
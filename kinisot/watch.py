@@ -0,0 +1,109 @@
+#!/usr/bin/python
+
+# Comments and/or additions are welcome (send e-mail to:
+# robert.paton@colostate.edu
+
+import os, sys, glob, json, time, itertools
+from argparse import ArgumentParser
+
+# Importing regardless of relative import
+try:
+    from .batch import read_manifest, job_files, run_job, write_results, open_store
+    from .cache import MemoryCache
+except:
+    from batch import read_manifest, job_files, run_job, write_results, open_store
+    from cache import MemoryCache
+
+def expand_job(job):
+   # The jobs described by a job spec whose files may be glob patterns: one job for each
+   # combination of matching files, so "ts_*.log" gives a job per TS that has appeared
+   choices = []
+   for key in ["rct", "ts", "prd"]:
+      for pattern in job[key] or []:
+         if glob.has_magic(pattern): choices.append([(key, file) for file in sorted(glob.glob(pattern))])
+         else: choices.append([(key, pattern)])
+   jobs = []
+   for combination in itertools.product(*choices):
+      expanded = dict(job, rct=[], ts=[] if job["ts"] else None, prd=[] if job["prd"] else None)
+      for key, file in combination: expanded[key].append(file)
+      jobs.append(expanded)
+   return jobs
+
+class Watcher:
+   # Recomputes isotope effects as Gaussian jobs finish. Each poll expands the job spec
+   # against the files present, checks every input by modification time and size, and
+   # runs only the jobs whose inputs are all complete (parsed with an NImag archive) and
+   # have changed since they were last computed. Structures stay in a MemoryCache, so an
+   # unchanged log is never parsed again, and a log that is still being written is only
+   # read again once it changes.
+   def __init__(self, jobs, cache=None, store=None):
+      self.jobs, self.store = jobs, store
+      self.cache = cache if cache is not None else MemoryCache()
+      # job -> stamps of the inputs it was computed from; file -> stamp at which it was incomplete
+      self.computed, self.incomplete = {}, {}
+
+   def stamp(self, file):
+      # (mtime, size) of a complete output, or None while it is missing or unfinished
+      try: stat = os.stat(file)
+      except OSError: return None
+      stamp = (stat.st_mtime_ns, stat.st_size)
+      if self.incomplete.get(file) == stamp: return None
+      try: self.cache.load(file)
+      except (ValueError, OSError):
+         self.incomplete[file] = stamp
+         return None
+      self.incomplete.pop(file, None)
+      return stamp
+
+   def poll(self):
+      # The results of every job computed in this poll
+      results = []
+      for job in [expanded for job in self.jobs for expanded in expand_job(job)]:
+         stamps = [self.stamp(file) for file in job_files(job)]
+         if None in stamps: continue
+         key = json.dumps([job[column] for column in ["rct", "ts", "prd", "iso", "T", "scale", "cutoff"]])
+         if self.computed.get(key) == stamps: continue
+         self.computed[key] = stamps
+         results.append(run_job(job, {}, self.cache, self.store))
+      return results
+
+def watch(watcher, out, interval=30.0, polls=None, header=True):
+   """
+   Polls every interval seconds, appending the new results of each poll to out as
+   CSV rows (see batch.write_results), until interrupted or after polls polls
+   """
+   count = 0
+   while polls is None or count < polls:
+      if count: time.sleep(interval)
+      results = watcher.poll()
+      if results:
+         write_results(results, out, header)
+         header = False
+      count += 1
+
+def watch_main(argv=None):
+   # python -m kinisot watch spec.jsonl [--dir results/] [--interval 30] [-o kies.csv]
+   parser = ArgumentParser(prog="kinisot watch", description="Recompute isotope effects as the output files of a job spec appear or change")
+   parser.add_argument("spec", help="CSV or JSON-lines job spec, as for kinisot batch; files may be glob patterns such as ts_*.log")
+   parser.add_argument("--dir", dest="directory", default=None, help="directory of the output files (default: that of the spec)")
+   parser.add_argument("--interval", dest="interval", type=float, default=30.0, help="seconds between polls (default 30)")
+   parser.add_argument("--once", dest="once", action="store_true", default=False, help="poll once and exit")
+   parser.add_argument("-o", dest="output", default=None, help="CSV file to append the results to (default: standard output)")
+   parser.add_argument("--store", dest="store", default=None, help="SQLite file of computed results: jobs already in it are not recomputed")
+   parser.add_argument("--memory", dest="memory", type=float, default=1024.0, help="memory for resident structures and eigenvalues in MB (default 1024)")
+   options = parser.parse_args(argv)
+
+   try:
+      jobs = read_manifest(options.spec, options.directory)
+   except (ValueError, OSError) as e:
+      print("o  " + str(e)); return 1
+
+   watcher = Watcher(jobs, MemoryCache(int(options.memory * 1024**2)), open_store(options.store))
+   header = options.output == None or not os.path.exists(options.output) or os.path.getsize(options.output) == 0
+   out = open(options.output, 'a', newline='') if options.output else sys.stdout
+   try:
+      watch(watcher, out, options.interval, 1 if options.once else None, header)
+   except KeyboardInterrupt: pass
+   finally:
+      if options.output: out.close()
+   return 0
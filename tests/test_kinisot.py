@@ -12,6 +12,7 @@ constants fix (ATOMIC_MASS_UNIT typo), which moved KIE values by <3e-6
 relative; the shipped .dat files still agree to their printed 6 decimals.
 """
 
+import socket
 import pytest
 from kinisot import Kinisot
 from conftest import datapath
@@ -135,3 +136,842 @@ def test_ts_imaginary_frequency_detected():
                         ['5', '5'], 393.0, 0.961)
     assert rpfrs[2].im_frequency_wn == pytest.approx(463.9, abs=0.05)
     assert not hasattr(rpfrs[0], "im_frequency_wn")  # ground state has none
+
+
+def test_structure_parsed_once_matches_filenames():
+    # Parsed Structures can stand in for filenames and give identical results
+    from kinisot.Hess_to_Freq import Structure, level_of_theory, is_linear
+    gs, ts = Structure(datapath('gaussian/claisen_gs.out')), Structure(datapath('gaussian/claisen_ts.out'))
+    assert gs.natoms == 14 and len(gs.masses) == 14
+    assert len(gs.force_constants) == 42 * 43 // 2
+    assert level_of_theory(gs) == "RB3LYP/6-31G(d)"
+    assert is_linear(gs) == 'none'
+    from_files = run_kie(['gaussian/claisen_gs.out'], ['gaussian/claisen_ts.out'], None, ['4', '4'], 393.0, 0.961)
+    from_structures = Kinisot.compute_isotope_effect([gs], [ts], None, ['4', '4'], 393.0, 0.961)
+    for a, b in zip(from_files[1:], from_structures[1:]):
+        assert a == pytest.approx(b, rel=1e-12)
+
+
+def test_structure_unparseable_raises(tmp_path):
+    from kinisot.Hess_to_Freq import Structure
+    bad = tmp_path / "sp.out"
+    bad.write_text(" NAtoms=    3 NActive=    3\n SCF Done:  E(RHF) =  -1.0\n")
+    with pytest.raises(ValueError, match="Error parsing"):
+        Structure(str(bad))
+
+
+def test_scan_matches_single_site_runs():
+    # One scan process reproduces the per-atom claisen_kinisot.sh runs
+    rows = Kinisot.scan_isotope_effects([datapath('gaussian/claisen_gs.out')], [datapath('gaussian/claisen_ts.out')],
+                                        None, temperature=393.0, freq_scale_factor=0.961, batch_size=5)
+    assert [row["label"] for row in rows] == [str(i) for i in range(1, 15)]
+    for case in CASES[:3]:
+        name, reactants, ts, prd, iso, temperature, scaling, vratio, ZPE, EXC, TRPF, KIE, tunn, corrKIE = case
+        row = Kinisot.scan_isotope_effects([datapath(reactants[0])], [datapath(ts[0])], None, [iso[0]],
+                                           temperature=temperature, freq_scale_factor=scaling)[0]
+        assert row["KIE"] == pytest.approx(KIE, rel=REL)
+        assert row["corr-KIE"] == pytest.approx(corrKIE, rel=REL)
+    assert rows[3]["KIE"] == pytest.approx(CASES[1][11], rel=REL)
+
+
+def test_scan_element_filter_and_eqe():
+    tmch = datapath('gaussian/tetramethylcyclohexane.out')
+    rows = Kinisot.scan_isotope_effects([tmch], None, [tmch], elements=['C'])
+    assert len(rows) == 10
+    assert all(row["KIE"] == pytest.approx(1.0) and row["V-ratio"] == 1.0 for row in rows)
+    with pytest.raises(ValueError, match="single reactant"):
+        Kinisot.scan_isotope_effects([tmch, tmch], None, [tmch])
+
+
+def test_read_hess_matches_elementwise_mass_weighting():
+    # The vectorized assembly reproduces the element-by-element definition
+    import numpy as np
+    from kinisot.Hess_to_Freq import Structure, read_hess, isotopologue_masses
+    gs = Structure(datapath('gaussian/claisen_gs.out'))
+    mw = read_hess(gs, '7,8')
+    masses = isotopologue_masses(gs, '7,8')
+    assert masses[6] == pytest.approx(2.0141) and masses[0] == pytest.approx(12.0)
+    l = 0
+    for m in range(3 * gs.natoms):
+        for n in range(m + 1):
+            expected = gs.force_constants[l] / np.sqrt(masses[m // 3] * masses[n // 3])
+            assert mw[m, n] == pytest.approx(expected, rel=1e-12)
+            assert mw[n, m] == mw[m, n]
+            l += 1
+
+
+def test_grid_matches_pointwise_results():
+    # Claisen C5 at two temperatures and two scale factors from one diagonalization each
+    rct, ts = [datapath('gaussian/claisen_gs.out')], [datapath('gaussian/claisen_ts.out')]
+    grid = Kinisot.compute_isotope_effect_grid(rct, ts, None, ['5', '5'], [298.15, 393.0], [1.0, 0.961])
+    assert grid["KIE"].shape == (2, 2)
+    assert grid["KIE"][1, 1] == pytest.approx(CASES[0][11], rel=REL)
+    assert grid["corr-KIE"][1, 1] == pytest.approx(CASES[0][13], rel=REL)
+    assert grid["corr-KIE"][0, 0] == pytest.approx(CASES[3][13], rel=REL)
+    assert grid["1D-tunn"][0, 0] == pytest.approx(CASES[3][12], rel=REL)
+    point = run_kie(['gaussian/claisen_gs.out'], ['gaussian/claisen_ts.out'], None, ['5', '5'], 298.15, 0.961)
+    assert grid["KIE"][0, 1] == pytest.approx(point[4], rel=1e-10)
+    assert grid["EXC"][0, 1] == pytest.approx(point[2], rel=1e-10)
+
+
+def test_grid_eqe_and_low_temperature():
+    tmch = [datapath('gaussian/tetramethylcyclohexane.out')]
+    grid = Kinisot.compute_isotope_effect_grid(tmch, None, tmch, ['24,25,26', '28,29,30'], [5.0, 290.0, 300.0], [1.0])
+    assert grid["corr-KIE"][1, 0] == pytest.approx(CASES[7][13], rel=REL)
+    assert grid["corr-KIE"][2, 0] == pytest.approx(CASES[8][13], rel=REL)
+    # the exponential terms are evaluated in log form and do not overflow at 5 K
+    assert all(grid[column][0, 0] == grid[column][0, 0] for column in Kinisot.RESULT_COLUMNS)
+
+
+def test_cache_skips_parsing_on_second_run(tmp_path, monkeypatch):
+    from kinisot.cache import HessianCache
+    from kinisot.Hess_to_Freq import Structure
+    gs, ts = datapath('gaussian/claisen_gs.out'), datapath('gaussian/claisen_ts.out')
+    first = HessianCache(str(tmp_path))
+    expected = Kinisot.compute_isotope_effect([first.load(gs)], [first.load(ts)], None, ['4', '4'], 393.0, 0.961)
+    assert first.hits == 0 and first.misses > 0
+
+    # a new cache on the same directory must not touch the text parser at all
+    def no_parsing(self, file):
+        raise AssertionError("log was parsed again")
+    monkeypatch.setattr(Structure, "__init__", no_parsing)
+    second = HessianCache(str(tmp_path))
+    rct = second.load(gs)
+    assert rct.level == "RB3LYP/6-31G(d)" and rct.rot_constants is not None
+    result = Kinisot.compute_isotope_effect([rct], [second.load(ts)], None, ['4', '4'], 393.0, 0.961)
+    assert second.misses == 0 and second.hits == 6
+    for a, b in zip(expected[1:], result[1:]):
+        assert a == pytest.approx(b, rel=1e-12)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    import os
+    from kinisot.cache import HessianCache
+    from kinisot.Hess_to_Freq import PARSER_VERSION
+    cache = HessianCache(str(tmp_path), max_bytes=10000)
+    gs = cache.load(datapath('gaussian/claisen_gs.out'))
+    os.utime(os.path.join(str(tmp_path), os.listdir(str(tmp_path))[0]), (1, 1))
+    cache.load(datapath('gaussian/claisen_ts.out'))
+    sizes = [os.path.getsize(os.path.join(str(tmp_path), name)) for name in os.listdir(str(tmp_path))]
+    assert len(sizes) == 1 and sum(sizes) <= 10000
+    assert not os.path.exists(os.path.join(str(tmp_path), gs.digest + "-p%d.npz" % PARSER_VERSION))
+
+
+def test_cache_writes_concurrently_and_evicts_on_demand(tmp_path, monkeypatch):
+    import os
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor
+    from kinisot.cache import HessianCache
+    cache = HessianCache(str(tmp_path))
+    structure = cache.load(datapath('gaussian/claisen_gs.out'))
+    scans = []
+    monkeypatch.setattr(cache, "evict", lambda original=cache.evict: scans.append(1) or original())
+
+    # threads writing the same entry use their own temporary files
+    eigenvalues = np.arange(42.0)
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda k: cache.save_eigenvalues(structure, structure.masses + k % 2, eigenvalues), range(32)))
+    assert sorted(name[-4:] for name in os.listdir(str(tmp_path))) == ['.npy', '.npy', '.npz']
+    assert np.array_equal(cache.load_eigenvalues(structure, structure.masses), eigenvalues)
+    # the directory is not listed while the running total is below max_bytes
+    assert scans == []
+
+
+def test_tail_parser_reads_final_job_across_block_boundaries(tmp_path, monkeypatch):
+    # A multi-step log (here two jobs concatenated) is parsed from its final archive,
+    # also when the markers are split across the blocks read backwards from EOF
+    import os
+    import numpy as np
+    from kinisot import Hess_to_Freq
+    gs, ts = datapath('gaussian/claisen_gs.out'), datapath('gaussian/claisen_ts.out')
+    combined = tmp_path / "gs_then_ts.out"
+    with open(gs, 'rb') as f, open(ts, 'rb') as g: combined.write_bytes(f.read() + g.read())
+    expected = Hess_to_Freq.Structure(ts)
+    for block in [1 << 16, 4096, 37]:
+        monkeypatch.setattr(Hess_to_Freq, "TAIL_BLOCK", block)
+        tail = Hess_to_Freq.read_tail(str(combined))
+        assert tail.lstrip().startswith("Atom     1 has atomic number") and len(tail) < os.path.getsize(ts) / 2
+        parsed = Hess_to_Freq.Structure(str(combined))
+        assert np.array_equal(parsed.force_constants, expected.force_constants)
+        assert np.array_equal(parsed.masses, expected.masses)
+        assert parsed.rot_constants == expected.rot_constants and parsed.level == expected.level
+
+
+def test_tail_parser_finds_wrapped_nimag(tmp_path, monkeypatch):
+    # The archive may wrap a line inside "NImag=": the tail still starts at the final
+    # mass table rather than at the start of the file
+    import os
+    import numpy as np
+    from kinisot import Hess_to_Freq
+    gs, ts = datapath('gaussian/claisen_gs.out'), datapath('gaussian/claisen_ts.out')
+    with open(gs, 'rb') as f, open(ts, 'rb') as g: text = f.read() + g.read()
+    assert text.count(b'\\NImag=') == 2
+    wrapped = tmp_path / "wrapped.out"
+    for split, newline in [(3, b'\n '), (1, b'\r\n '), (5, b'\n ')]:
+        wrapped.write_bytes(text.replace(b'\\NImag=', b'\\' + b'NImag='[:split] + newline + b'NImag='[split:]))
+        for block in [1 << 16, 37]:
+            monkeypatch.setattr(Hess_to_Freq, "TAIL_BLOCK", block)
+            tail = Hess_to_Freq.read_tail(str(wrapped))
+            assert tail.lstrip().startswith("Atom     1 has atomic number") and len(tail) < os.path.getsize(ts) / 2
+        parsed = Hess_to_Freq.Structure(str(wrapped))
+        assert np.array_equal(parsed.force_constants, Hess_to_Freq.Structure(ts).force_constants)
+
+
+def test_batch_manifest_in_order_with_process_pool(tmp_path, monkeypatch):
+    import json
+    from kinisot import batch
+    gs, ts = datapath('gaussian/claisen_gs.out'), datapath('gaussian/claisen_ts.out')
+    manifest = tmp_path / "jobs.jsonl"
+    lines = [{"rct": gs, "ts": ts, "iso": "5", "T": 393.0, "scale": 0.961},
+             {"rct": [datapath('gaussian/dienophile.out'), datapath('gaussian/diene.out')],
+              "ts": datapath('gaussian/DATS.out'), "iso": ["0", "6", "15"], "scale": 0.963},
+             {"rct": gs, "ts": ts, "iso": "4", "T": 393.0, "scale": 0.961},
+             {"rct": gs, "ts": gs, "iso": "4"}]
+    manifest.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+    jobs = batch.read_manifest(str(manifest))
+    assert jobs[0]["iso"] == ['5', '5'] and jobs[3]["T"] == 298.15 and jobs[3]["scale"] is None
+    assert len(batch.job_chunks(jobs, 1)) == 3  # jobs 0 and 2 share their files
+    chunk = batch.job_chunks(jobs, 1)[0]
+    assert batch._run_chunk(chunk)[0][1]["KIE"] == pytest.approx(CASES[0][11], rel=REL)
+    assert batch._parsed == {}  # a worker does not keep the structures of finished chunks
+
+    # a single process reads each group's files when it reaches them, and releases them after their last job
+    held, prefetch = [], batch.prefetch
+    monkeypatch.setattr(batch, "prefetch", lambda jobs, parsed, cache=None: (prefetch(jobs, parsed, cache), held.append(len(parsed))))
+    stream = batch.run_batch(jobs, 1)
+    assert next(stream)["KIE"] == pytest.approx(CASES[0][11], rel=REL) and held == [2]
+    list(stream)
+    assert held == [2, 5, 2, 1]  # claisen stays parsed until job 2, its last use
+    monkeypatch.undo()
+
+    for n_jobs in [1, 2]:
+        results = list(batch.run_batch(jobs, n_jobs))
+        assert [r["iso"] for r in results] == [job["iso"] for job in jobs]
+        assert results[0]["KIE"] == pytest.approx(CASES[0][11], rel=REL)
+        assert results[1]["corr-KIE"] == pytest.approx(CASES[5][13], rel=REL)
+        assert results[2]["KIE"] == pytest.approx(CASES[1][11], rel=REL)
+        assert "imaginary frequency" in results[3]["error"]
+
+
+@pytest.mark.parametrize("method", ["teller-redlich", "log-det"])
+@pytest.mark.parametrize("case", [CASES[0], CASES[2], CASES[5], CASES[6], CASES[7]], ids=lambda c: c[0])
+def test_fast_product_factor_consistent_with_eigenvalues(case, method):
+    # V-ratio x TRPF without diagonalization agrees with the eigenvalue path to within
+    # the effect of not projecting translations/rotations out of the Hessian
+    name, reactants, ts, prd, iso, temperature, scaling, vratio, ZPE, EXC, TRPF = case[:11]
+    rct = [datapath(p) for p in reactants]
+    ts = [datapath(p) for p in ts] if ts else None
+    prd = [datapath(p) for p in prd] if prd else None
+    fast, reference, deviation, ok = Kinisot.check_product_factor(rct, ts, prd, iso, method=method)
+    assert reference == pytest.approx(vratio * TRPF, rel=REL)
+    assert ok and fast == pytest.approx(vratio * TRPF, rel=2e-3)
+
+
+def test_log_det_product_matches_eigenvalues(monkeypatch):
+    # Relative to the unsubstituted structure, the log-det of each isotopologue is the log
+    # of the product of its internal eigenvalues, found without an eigendecomposition
+    import numpy as np
+    from kinisot.Hess_to_Freq import Structure
+    structures = [Structure(datapath('gaussian/claisen_gs.out')), Structure(datapath('gaussian/claisen_ts.out'))]
+    isos = ['0', '3', '7,8']
+    expected = []
+    for structure in structures:
+        logs = [np.sum(np.log(np.sort(np.abs(eigs))[6:])) for eigs in Kinisot.calc_isotopologue_eigenvalues(structure, isos)]
+        expected.append(np.subtract(logs[1:], logs[0]))
+
+    def no_eigensolver(*args, **kwargs):
+        raise AssertionError("diagonalized")
+    monkeypatch.setattr(np.linalg, "eigh", no_eigensolver)
+    monkeypatch.setattr(np.linalg, "eigvalsh", no_eigensolver)
+    for structure, reference in zip(structures, expected):
+        log_dets = [Kinisot.calc_log_det_product(structure, iso) for iso in isos]
+        assert np.subtract(log_dets[1:], log_dets[0]) == pytest.approx(reference, abs=1e-3)
+
+    # the unsubstituted log-det is computed once per structure
+    calls, original = [], Kinisot.calc_log_det_product
+    monkeypatch.setattr(Kinisot, "calc_log_det_product", lambda structure, iso: calls.append(iso) or original(structure, iso))
+    for label in [['3', '3'], ['7,8', '7,8']]:
+        Kinisot.compute_product_factor(structures[:1], structures[1:], None, label, method="log-det")
+    assert calls.count('0') == 2 and structures[0] in Kinisot.reference_log_dets
+
+
+def test_startup_defers_optional_imports():
+    # The scaling table is usable without NumPy, and importing the calculator does
+    # not pull in the modules only needed for caching, batch runs or concurrent loading
+    import subprocess, sys
+    code = ("import sys; import kinisot.vib_scale_factors as v; "
+            "assert v.scaling_index()[v.normalize_level('B3LYP/6-31G(d)')][1] == 0.977; "
+            "assert 'numpy' not in sys.modules; "
+            "import kinisot.Kinisot; "
+            "print(' '.join(m for m in ['hashlib', 'pathlib', 'multiprocessing', 'csv', 'json', 'asyncio', 'concurrent.futures', 'sqlite3', 'kinisot.cache'] if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_synthetic_benchmark_outputs(tmp_path):
+    # Generated archives parse like real logs: a ground state with six zero modes and
+    # a TS with exactly one imaginary mode
+    import numpy as np
+    from kinisot import benchmark
+    from kinisot.Hess_to_Freq import Structure, read_hess, rotational_constants
+    gs = benchmark.write_synthetic_output(str(tmp_path / "gs.out"), 20)
+    ts = benchmark.write_synthetic_output(str(tmp_path / "ts.out"), 20, ts=True)
+    for file, n_imaginary in [(gs, 0), (ts, 1)]:
+        structure = Structure(file)
+        assert structure.natoms == 20 and structure.level == "RB3LYP/6-31G(d)"
+        eigs = Kinisot.calc_eigenvalues(read_hess(structure, '0'))
+        frequencies = np.copysign(np.sqrt(np.abs(eigs)), eigs)
+        assert np.sum(frequencies < -50.0) == n_imaginary
+        assert np.sum(np.abs(frequencies) < 1.0) == 6
+        # the rotational constants in the log agree with those of the archive geometry
+        assert structure.rot_constants == pytest.approx(rotational_constants(structure.coordinates, structure.masses), rel=1e-4)
+    assert Kinisot.compute_isotope_effect([gs], [ts], None, ['3', '3'])[4] > 0
+
+
+def test_benchmark_run_and_compare():
+    import json
+    from kinisot import benchmark
+    from kinisot.Hess_to_Freq import Structure
+    base = benchmark.run_benchmarks(sizes=[10], repeat=1, match="synthetic_10")
+    names = set(base["results"])
+    assert "compute_isotope_effect[synthetic_10]" in names and "diagonalize[synthetic_10_ts]" in names
+    assert all(result["best"] > 0 and result["peak_bytes"] > 0 for result in base["results"].values())
+    new = json.loads(json.dumps(base))
+    new["results"]["parse[synthetic_10_gs]"]["best"] *= 1.5
+    slower = [row[0] for row in benchmark.compare_benchmarks(base, new, threshold=0.2) if row[4]]
+    assert slower == ["parse[synthetic_10_gs]"]
+
+    # every timed call diagonalizes, rather than finding the eigenvalues of the previous one
+    structure = Structure(datapath('gaussian/claisen_gs.out'))
+    benchmark.time_call(lambda: Kinisot.calc_rpfr([structure], ['5']), repeat=3)
+    benchmark.peak_memory(lambda: Kinisot.calc_rpfr([structure], ['5']))
+    assert Kinisot.eigenvalue_memo.stats()["hits"] == 0
+
+
+def test_profiling_counts_phases():
+    from kinisot import profiling
+    name, reactants, ts, prd, iso, temperature, scaling = CASES[0][:7]
+    profiling.reset()
+    run_kie(reactants, ts, prd, iso, temperature, scaling)
+    assert profiling.timers == {} and profiling.counters == {}  # disabled by default
+
+    Kinisot.eigenvalue_memo.clear()
+    profiling.enable()
+    try:
+        run_kie(reactants, ts, prd, iso, temperature, scaling)
+        result = profiling.report(total=10.0)
+    finally:
+        profiling.disable(); profiling.reset()
+    phases = dict((phase["phase"], phase) for phase in result["phases"])
+    assert phases["read"]["calls"] == 2 and result["counters"]["eigen-solves (n=42)"] == 4
+    assert phases["parse"]["inclusive"] >= phases["parse"]["seconds"] + phases["read"]["seconds"] * 0.99
+    assert result["counters"]["files read"] == 2 and result["counters"]["matrices built"] == 4
+    assert sum(phase["seconds"] for phase in result["phases"]) + result["other"] == pytest.approx(10.0)
+
+
+def test_profiling_counts_from_threads():
+    # counters and timers updated from many threads at once lose no updates
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+    from kinisot import profiling
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    def work(_):
+        for _ in range(2000):
+            profiling.count("calls")
+            with profiling.timer("phase"): profiling.count("bytes", 3)
+    profiling.reset(); profiling.enable()
+    try:
+        with ThreadPoolExecutor(8) as pool: list(pool.map(work, range(8)))
+        result = profiling.report()
+    finally:
+        profiling.disable(); profiling.reset()
+        sys.setswitchinterval(interval)
+    assert result["counters"] == {"calls": 16000, "bytes": 48000}
+    assert result["phases"][0]["calls"] == 16000
+
+
+def test_serve_keeps_structures_resident(monkeypatch):
+    import io, json
+    from kinisot import server
+    from kinisot.cache import MemoryCache
+    from kinisot.Hess_to_Freq import Structure
+    parses = []
+    original = Structure.__init__
+    monkeypatch.setattr(Structure, "__init__", lambda self, file: parses.append(file) or original(self, file))
+
+    gs, ts = datapath('gaussian/claisen_gs.out'), datapath('gaussian/claisen_ts.out')
+    query = {"rct": gs, "ts": ts, "iso": "5", "T": 393.0, "scale": 0.961}
+    lines = [json.dumps(dict(query, id=1)), json.dumps(dict(query, id=2, iso="1")), "not json",
+             json.dumps({"rct": gs, "ts": gs, "iso": "5"}), json.dumps({"cmd": "stats"}), json.dumps({"rct": 5, "ts": "x"})]
+    out, cache = io.StringIO(), MemoryCache()
+    server.serve_stream(lines, out, cache)
+    responses = [json.loads(line) for line in out.getvalue().splitlines()]
+
+    assert [r.get("id") for r in responses] == [1, 2, None, None, None, None]
+    assert responses[0]["ok"] and responses[0]["KIE"] == pytest.approx(CASES[0][11], rel=REL)
+    assert responses[1]["ok"] and not responses[2]["ok"] and "imaginary frequency" in responses[3]["error"]
+    assert len(parses) == 2  # each log parsed once, by the first query
+    assert responses[4]["structures"] == 2 and responses[4]["hits"] > 0
+    assert not responses[5]["ok"] and "TypeError" in responses[5]["error"]  # and the server carries on
+
+    # a structure held beyond the memory limit is dropped and parsed again when needed,
+    # and its eigenvalues are not kept outside the limit by the eigenvalue memo
+    Kinisot.eigenvalue_memo.clear()
+    small = MemoryCache(max_bytes=1)
+    server.handle_request(query, small)
+    assert len(small.entries) == 1
+    assert Kinisot.eigenvalue_memo.stats()["entries"] == 0
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available on this platform")
+def test_serve_unix_socket(tmp_path):
+    import os, json, threading
+    from kinisot import server
+    from kinisot.cache import MemoryCache
+    path, started = str(tmp_path / "kinisot.sock"), []
+    ready = threading.Event()
+    thread = threading.Thread(target=server.serve_socket, args=(path, MemoryCache()),
+                              kwargs={"ready": lambda s: (started.append(s), ready.set())}, daemon=True)
+    thread.start()
+    assert ready.wait(10)
+    try:
+        query = {"id": "a", "rct": datapath('gaussian/claisen_gs.out'), "ts": datapath('gaussian/claisen_ts.out'),
+                 "iso": "5", "T": 393.0, "scale": 0.961}
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+            stream = client.makefile('rw')
+            for _ in range(2):
+                stream.write(json.dumps(query) + "\n"); stream.flush()
+                response = json.loads(stream.readline())
+                assert response["id"] == "a" and response["KIE"] == pytest.approx(CASES[0][11], rel=REL)
+    finally:
+        started[0].shutdown()
+        thread.join(10)
+    assert not os.path.lexists(path)
+
+    # a file at the socket path that is not a socket is left alone
+    with open(path, 'w') as f: f.write("data")
+    with pytest.raises(ValueError, match="not a socket"):
+        server.serve_socket(path, MemoryCache())
+    assert server.serve_main(["--socket", path]) == 1
+    with open(path) as f: assert f.read() == "data"
+
+
+def test_parsed_inputs_skip_asyncio():
+    # With every input already parsed (as on the command line) nothing is loaded
+    # concurrently, and the synchronous path does not import asyncio
+    import subprocess, sys
+    code = ("import sys; from kinisot import Kinisot; from kinisot.Hess_to_Freq import Structure; "
+            "s = [Structure(%r), Structure(%r)]; "
+            "print(Kinisot.compute_isotope_effect(s[:1], s[1:], None, ['5', '5'], 393.0, 0.961)[4], 'asyncio' in sys.modules)"
+            % (datapath('gaussian/claisen_gs.out'), datapath('gaussian/claisen_ts.out')))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    kie, imported = result.stdout.split()
+    assert float(kie) == pytest.approx(CASES[0][11], rel=REL) and imported == "False"
+
+
+def test_async_loading_overlaps_files(monkeypatch):
+    import asyncio, threading, time
+    from kinisot.Hess_to_Freq import Structure
+    active, peak, lock = [0], [0], threading.Lock()
+    original = Structure.__init__
+
+    def slow_init(self, file):
+        # a slow filesystem: each read blocks for a while
+        with lock: active[0] += 1; peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock: active[0] -= 1
+        original(self, file)
+    monkeypatch.setattr(Structure, "__init__", slow_init)
+
+    name, reactants, ts, prd, iso, temperature, scaling = CASES[4][:7]  # two reactants and a TS
+    files = [datapath(p) for p in reactants + ts]
+    result = asyncio.run(Kinisot.compute_isotope_effect_async(files[:2], files[2:], None, iso, temperature, scaling, concurrency=2))
+    assert result[4] == pytest.approx(CASES[4][11], rel=REL)
+    assert peak[0] == 2
+
+    # the synchronous wrapper also works from inside a running event loop
+    async def inside_loop():
+        return Kinisot.compute_isotope_effect(files[:2], files[2:], None, iso, temperature, scaling)
+    assert asyncio.run(inside_loop())[4] == pytest.approx(CASES[4][11], rel=REL)
+
+    structures = asyncio.run(Kinisot.load_structures_async(files + [files[0], "missing.out"], return_exceptions=True))
+    assert structures[0] is structures[3] and isinstance(structures[4], OSError)
+
+
+def test_isotopologue_eigenvalues_use_one_work_array(tmp_path):
+    # Hessians are expanded from the packed force constants into a reused work
+    # array, so that the peak memory of a diagonalization is about one matrix
+    import numpy as np
+    from kinisot import benchmark
+    from kinisot.Hess_to_Freq import Structure, read_hess
+    structure = Structure(benchmark.write_synthetic_output(str(tmp_path / "ts.out"), 60, ts=True))
+    matrix_bytes = (3 * 60) ** 2 * 8
+    peak = benchmark.peak_memory(lambda: Kinisot.calc_isotopologue_eigenvalues(structure, ['3'], batch_size=1))
+    assert peak < 1.2 * matrix_bytes
+
+    eigs = Kinisot.calc_isotopologue_eigenvalues(structure, ['0', '3', '1,2'], batch_size=2)
+    for iso, values in zip(['0', '3', '1,2'], eigs):
+        expected = np.linalg.eigvalsh(read_hess(structure, iso) * Kinisot.UNIT_CONVERSION)
+        assert np.allclose(values, expected, rtol=1e-10, atol=1e-6)
+
+
+@pytest.mark.parametrize("format", ["csv", "jsonl", "npz"])
+def test_result_writer_formats(tmp_path, format):
+    import csv, json
+    import numpy as np
+    from kinisot.output import ResultWriter, OUTPUT_COLUMNS
+    gs, ts = datapath('gaussian/claisen_gs.out'), datapath('gaussian/claisen_ts.out')
+    rows = Kinisot.scan_isotope_effects([gs], [ts], None, ['5', '7,8'], temperature=393.0, freq_scale_factor=0.961)
+    rows = [dict(row, iso=row["label"], T=393.0, scale=0.961) for row in rows]
+    rows.append({"iso": "24;28", "T": 300.0, "scale": 1.0, "KIE": 1.5, "im-freq": np.nan})  # EQE-like row
+    path = str(tmp_path / ("results." + format))
+    with ResultWriter(path, format) as writer: writer.write_rows(rows)
+
+    if format == "csv":
+        with open(path) as f: table = list(csv.DictReader(f))
+        assert list(table[0]) == OUTPUT_COLUMNS
+        kie, iso, freq = [float(r["KIE"]) for r in table], [r["iso"] for r in table], table[0]["im-freq"]
+    elif format == "jsonl":
+        with open(path) as f: table = [json.loads(line) for line in f]
+        kie, iso, freq = [r["KIE"] for r in table], [r["iso"] for r in table], table[0]["im-freq"]
+        assert table[2]["im-freq"] is None and table[2]["ZPE"] is None
+    else:
+        with np.load(path) as table:
+            kie, iso, freq = list(table["KIE"]), list(table["iso"]), table["im-freq"][0]
+            assert np.isnan(table["ZPE"][2])
+    assert iso == ['5', '7,8', '24;28']
+    assert kie[0] == pytest.approx(CASES[0][11], rel=REL) and kie[1] == pytest.approx(CASES[2][11], rel=REL)
+    assert float(freq) == pytest.approx(rows[0]["im-freq"])
+
+
+def test_eigenvalue_memo_skips_repeated_diagonalizations(monkeypatch):
+    from kinisot.Hess_to_Freq import Structure
+    solves = []
+    original = Kinisot.solve_eigenvalues
+    monkeypatch.setattr(Kinisot, "solve_eigenvalues", lambda m: solves.append(len(m)) or original(m))
+    memo = Kinisot.eigenvalue_memo
+    memo.clear()
+
+    name, reactants, ts, prd, iso, temperature, scaling = CASES[0][:7]
+    first = run_kie(reactants, ts, prd, iso, temperature, scaling)
+    assert sum(solves) == 4 and memo.stats()["misses"] == 4
+    # the same files, parsed again, at another temperature: no new diagonalization
+    second = run_kie(reactants, ts, prd, iso, 298.15, scaling)
+    assert sum(solves) == 4 and memo.stats()["hits"] == 4
+    assert first[4] != second[4]
+
+    # a scan with labels that give the same mass vector: '4,5' = '5,4', and '1,200' = '1'
+    gs = Structure(datapath('gaussian/claisen_gs.out'))
+    del solves[:]
+    Kinisot.calc_isotopologue_eigenvalues(gs, ['3', '4,5', '5,4', '1', '1,200'])
+    assert sum(solves) == 3
+    rows = Kinisot.scan_isotope_effects([gs], [datapath('gaussian/claisen_ts.out')], None, ['4,5', '5,4'])
+    assert rows[0]["KIE"] == rows[1]["KIE"]
+
+
+def test_eigenvalue_memo_consulted_before_disk_cache(tmp_path, monkeypatch):
+    import os
+    from kinisot.cache import HessianCache
+    gs = datapath('gaussian/claisen_gs.out')
+    Kinisot.calc_isotopologue_eigenvalues(HessianCache(str(tmp_path / "a")).load(gs), ['0', '5'])
+
+    # eigenvalues read from the disk cache join the memo
+    Kinisot.eigenvalue_memo.clear()
+    cache = HessianCache(str(tmp_path / "a"))
+    structure = cache.load(gs)
+    Kinisot.calc_isotopologue_eigenvalues(structure, ['0', '5'])
+    assert cache.hits == 3 and Kinisot.eigenvalue_memo.stats()["entries"] == 2
+
+    # a memo hit reads nothing from the cache; an entry missing from another cache
+    # directory is stored there after a single check
+    monkeypatch.setattr(HessianCache, "load_eigenvalues", lambda *args: pytest.fail("read the disk cache"))
+    Kinisot.calc_isotopologue_eigenvalues(structure, ['0', '5'])
+    other = HessianCache(str(tmp_path / "b"))
+    other.load(gs)
+    structure = other.load(gs)
+    checks, original = [], os.path.exists
+    monkeypatch.setattr(os.path, "exists", lambda path: checks.append(path) or original(path))
+    for _ in range(3): Kinisot.calc_isotopologue_eigenvalues(structure, ['0', '5'])
+    assert len([path for path in checks if path.endswith('.npy')]) == 2
+    assert len([name for name in os.listdir(str(tmp_path / "b")) if name.endswith('.npy')]) == 2
+
+
+def test_conformer_ensemble_kie(tmp_path):
+    import math, os, shutil
+    from kinisot.Hess_to_Freq import Structure
+    name, reactants, ts, prd, iso, temperature, scaling = CASES[0][:7]
+    rct, ts = datapath(reactants[0]), datapath(ts[0])
+    assert Structure(rct).scf_energy == pytest.approx(-270.5072318)
+
+    # a single conformer per species reproduces the KIE and tunnelling-corrected KIE
+    single = Kinisot.compute_ensemble_isotope_effect([[rct]], [[ts]], None, iso, temperature, scaling)
+    assert single["KIE"] == pytest.approx(CASES[0][11], rel=REL)
+    assert single["corr-KIE"] == pytest.approx(CASES[0][13], rel=REL)
+
+    # a second reactant conformer 1 kcal/mol higher in energy, with the same RPFR
+    conformers = tmp_path / "gs"
+    conformers.mkdir()
+    shutil.copy(rct, str(conformers / "a.out"))
+    with open(rct) as f: text = f.read()
+    with open(str(conformers / "b.log"), "w") as f: f.write(text.replace("HF=-270.5072318", "HF=-270.5056382"))
+    files = Kinisot.expand_conformers(str(conformers))
+    assert [os.path.basename(f) for f in files] == ["a.out", "b.log"]
+    assert Kinisot.expand_conformers(str(conformers / "*.out")) == files[:1]
+    with pytest.raises(ValueError): Kinisot.expand_conformers(str(tmp_path / "*.log"))
+
+    result = Kinisot.compute_ensemble_isotope_effect([files], [[ts]], None, iso, temperature, scaling)
+    weights = [conformer["weight"] for conformer in result["conformers"]]
+    assert weights[1] / weights[0] == pytest.approx(math.exp(-0.0015936 * 4.35974434e-18 / (1.3806488e-23 * temperature)))
+    assert result["conformers"][1]["rel-energy"] == pytest.approx(1.0, rel=1e-3)
+    assert result["KIE"] == pytest.approx(single["KIE"], rel=REL)
+    assert math.isnan(result["ZPE"])
+
+
+def test_formatted_checkpoint_input(tmp_path):
+    import numpy as np
+    from kinisot import benchmark
+    from kinisot.Hess_to_Freq import Structure, is_linear, level_of_theory
+    name, reactants, ts, prd, iso, temperature, scaling = CASES[1][:7]
+    files = []
+    for path in reactants + ts:
+        structure = Structure(datapath(path))
+        fchk = benchmark.write_fchk(structure, str(tmp_path / (path.split("/")[-1][:-4] + ".fchk")))
+        parsed = Structure(fchk)
+        assert np.allclose(parsed.force_constants, structure.force_constants)
+        assert np.allclose(parsed.coordinates, structure.coordinates, atol=1e-6)
+        assert np.allclose(parsed.rot_constants, structure.rot_constants, rtol=1e-4)
+        assert parsed.scf_energy == structure.scf_energy
+        assert level_of_theory(fchk) == "RB3LYP/6-31G(d)" and is_linear(fchk) == "none"
+        files.append(fchk)
+
+    result = Kinisot.compute_isotope_effect(files[:1], files[1:], None, iso, temperature, scaling)
+    assert result[4] == pytest.approx(CASES[1][11], rel=REL)
+
+    with open(files[0]) as f: text = f.read()
+    with open(str(tmp_path / "truncated.fchk"), "w") as f: f.write(text[:len(text) // 2])
+    with pytest.raises(ValueError): Structure(str(tmp_path / "truncated.fchk"))
+
+
+@pytest.mark.parametrize("module, extension", [("gzip", ".gz"), ("lzma", ".xz"), ("bz2", ".bz2")])
+def test_compressed_outputs(tmp_path, module, extension):
+    import importlib, shutil
+    import numpy as np
+    from kinisot.Hess_to_Freq import Structure, is_linear, level_of_theory
+    name, reactants, ts, prd, iso, temperature, scaling = CASES[1][:7]
+    files = []
+    for path in reactants + ts:
+        compressed = str(tmp_path / (path.split("/")[-1] + extension))
+        with open(datapath(path), "rb") as f, importlib.import_module(module).open(compressed, "wb") as g:
+            shutil.copyfileobj(f, g)
+        structure, plain = Structure(compressed), Structure(datapath(path))
+        assert np.array_equal(structure.force_constants, plain.force_constants)
+        assert np.array_equal(structure.masses, plain.masses) and structure.rot_constants == plain.rot_constants
+        assert level_of_theory(compressed) == level_of_theory(plain) and is_linear(compressed) == "none"
+        files.append(compressed)
+    result = Kinisot.compute_isotope_effect(files[:1], files[1:], None, iso, temperature, scaling)
+    assert result[4] == pytest.approx(CASES[1][11], rel=REL)
+
+
+def test_result_store_resumes_and_deduplicates(tmp_path, monkeypatch):
+    import shutil
+    from kinisot import batch
+    from kinisot.store import ResultStore
+    solves = []
+    original = Kinisot.solve_eigenvalues
+    monkeypatch.setattr(Kinisot, "solve_eigenvalues", lambda m: solves.append(len(m)) or original(m))
+    Kinisot.eigenvalue_memo.clear()
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+
+    name, reactants, ts, prd, iso, temperature, scaling = CASES[0][:7]
+    first = run_kie(reactants, ts, prd, iso, temperature, scaling)
+    rct, ts = [datapath(reactants[0])], [datapath(ts[0])]
+    assert Kinisot.compute_isotope_effect(rct, ts, None, iso, temperature, scaling, store=store)[4] == first[4]
+    assert store.misses == 1 and len(store) == 1
+
+    # the same inputs under another name are found without any diagonalization
+    Kinisot.eigenvalue_memo.clear()
+    del solves[:]
+    renamed = str(tmp_path / "copy.out")
+    shutil.copy(ts[0], renamed)
+    stored = Kinisot.compute_isotope_effect(rct, [renamed], None, iso, temperature, scaling, store=store)
+    assert solves == [] and store.hits == 1
+    assert stored[4] == pytest.approx(first[4], rel=1e-12) and stored[5] == pytest.approx(first[5], rel=1e-12)
+    assert stored[0][2].im_frequency_wn == pytest.approx(first[0][2].im_frequency_wn)
+    Kinisot.compute_isotope_effect(rct, ts, None, iso, 298.15, scaling, store=store)
+    assert len(store) == 2
+
+    # a scan only computes the sites that are not stored yet
+    rows = Kinisot.scan_isotope_effects(rct, ts, None, ['5', '4'], temperature=temperature, freq_scale_factor=scaling, store=store)
+    assert len(store) == 3 and rows[0]["KIE"] == pytest.approx(first[4], rel=1e-12)
+    assert rows[1]["KIE"] == pytest.approx(CASES[1][11], rel=REL)
+
+    jobs = [batch.normalize_job({"rct": rct, "ts": ts, "iso": "4", "T": temperature, "scale": scaling})]
+    assert list(batch.run_batch(jobs, 1, store=store.path))[0]["KIE"] == pytest.approx(CASES[1][11], rel=REL)
+    assert len(store) == 3
+
+
+def test_cutoff_model_converges_to_full_kie():
+    import numpy as np
+    from kinisot.Hess_to_Freq import Structure, cutoff_atoms, truncate_structure, read_hess
+    name, reactants, ts, prd, iso, temperature, scaling = CASES[0][:7]
+    structures = [Structure(datapath(reactants[0])), Structure(datapath(ts[0]))]
+
+    # the packed block of a truncated structure is the block of the full Hessian
+    atoms = cutoff_atoms(structures[1], '5', radius=3.0)
+    assert 4 in atoms and len(atoms) < structures[1].natoms
+    assert set(cutoff_atoms(structures[1], '5', bonds=1)) < set(cutoff_atoms(structures[1], '5', bonds=2))
+    dofs = (3 * atoms[:, None] + np.arange(3)).ravel()
+    assert np.allclose(read_hess(truncate_structure(structures[1], atoms), '0'), read_hess(structures[1], '0')[np.ix_(dofs, dofs)])
+
+    models, labels = Kinisot.cutoff_model(structures, iso, radius=5.0)
+    assert labels[0] == str(list(models[0].atoms).index(4) + 1)
+    cutoff = Kinisot.compute_isotope_effect(models[:1], models[1:], None, labels, temperature, scaling)
+    assert cutoff[4] == pytest.approx(CASES[0][11], rel=1e-5)
+    models, labels = Kinisot.cutoff_model(structures, iso, radius=10.0)
+    assert models == structures and labels == iso
+
+    # a small model has no zero modes: its low real modes are kept, and a TS that
+    # loses its imaginary mode is rejected rather than using a real one instead
+    models, labels = Kinisot.cutoff_model(structures, iso, bonds=1)
+    assert not hasattr(Kinisot.calc_rpfr(models[:1], labels[:1], temperature, scaling), "im_frequency_wn")
+    with pytest.raises(ValueError, match="imaginary frequency"):
+        Kinisot.compute_isotope_effect(models[:1], models[1:], None, labels, temperature, scaling)
+
+    rows = Kinisot.scan_isotope_effects(structures[:1], structures[1:], None, ['5', '4'], temperature=temperature,
+                                        freq_scale_factor=scaling, radius=5.0)
+    assert rows[0]["KIE"] == pytest.approx(cutoff[4], rel=1e-12)
+    assert rows[1]["KIE"] == pytest.approx(CASES[1][11], rel=1e-3)
+
+
+def test_cutoff_scan_falls_back_without_imaginary_mode():
+    # At 2 Angstrom the Claisen TS model of C1 no longer contains the reaction coordinate:
+    # that site is computed from the full Hessians with a warning, and C3 from its models
+    from kinisot.Hess_to_Freq import Structure
+    structures = [Structure(datapath('gaussian/claisen_gs.out')), Structure(datapath('gaussian/claisen_ts.out'))]
+    full = Kinisot.scan_isotope_effects(structures[:1], structures[1:], None, ['1', '3'])
+    with pytest.warns(UserWarning, match="site 1 has no imaginary frequency"):
+        rows = Kinisot.scan_isotope_effects(structures[:1], structures[1:], None, ['1', '3'], radius=2.0)
+    assert rows[0]["corr-KIE"] == pytest.approx(full[0]["corr-KIE"], rel=1e-12)
+    assert rows[1]["corr-KIE"] != pytest.approx(full[1]["corr-KIE"], rel=1e-6)
+    assert rows[1]["corr-KIE"] == pytest.approx(full[1]["corr-KIE"], rel=2e-2)
+
+
+def test_cutoff_model_keeps_the_same_modes_of_both_isotopologues():
+    # A mode of the DATS site 12 reactant model lies at the cut-off: chosen per isotopologue,
+    # the labelled one kept a mode fewer and the KIE came out near 290 rather than 0.98
+    import numpy as np
+    from kinisot.Hess_to_Freq import Structure
+    structures = [Structure(datapath('gaussian/DATS_rct.out')), Structure(datapath('gaussian/DATS.out'))]
+    models, labels = Kinisot.cutoff_model(structures, ['12', '12'], radius=4.0)
+    light = Kinisot.calc_rpfr(models[:1], ['0'])
+    heavy = Kinisot.calc_rpfr(models[:1], labels[:1], modes=light.modes)
+    assert len(heavy.frequency_wn) == len(light.frequency_wn)
+    assert np.array_equal(heavy.modes[0][1], light.modes[0][1])
+    full = Kinisot.scan_isotope_effects(structures[:1], structures[1:], None, ['12'])
+    rows = Kinisot.scan_isotope_effects(structures[:1], structures[1:], None, ['12'], radius=4.0)
+    assert rows[0]["corr-KIE"] == pytest.approx(full[0]["corr-KIE"], rel=1e-2)
+    cutoff = Kinisot.compute_isotope_effect(models[:1], models[1:], None, labels)
+    assert cutoff[5] == pytest.approx(rows[0]["corr-KIE"], rel=1e-12)
+
+
+def test_screened_scan_estimates_within_error():
+    import numpy as np
+    from kinisot import profiling
+    from kinisot.Hess_to_Freq import Structure
+    structures = [Structure(datapath('gaussian/claisen_gs.out')), Structure(datapath('gaussian/claisen_ts.out'))]
+    exact = Kinisot.scan_isotope_effects(structures[:1], structures[1:], None, temperature=393.0, freq_scale_factor=0.961)
+
+    # both first-order estimates of a 13C isotopologue are closer than the unsubstituted eigenvalues
+    modes = Kinisot.calc_normal_modes(structures[0])
+    rayleigh, pencil = Kinisot.estimate_isotopologue_eigenvalues(structures[0], modes, '5')
+    eigs = Kinisot.calc_isotopologue_eigenvalues(structures[0], ['5'])[0]
+    for estimate in [rayleigh, pencil]:
+        assert np.max(np.abs(estimate - eigs)[6:] / eigs[6:]) < 0.5 * np.max(np.abs(modes[0] - eigs)[6:] / eigs[6:])
+
+    rows = Kinisot.scan_isotope_effects(structures[:1], structures[1:], None, temperature=393.0, freq_scale_factor=0.961, screen=1e-3)
+    screened = [row for row in rows if not row["refined"]]
+    assert 0 < len(screened) < len(rows)
+    for row, reference in zip(rows, exact):
+        assert row["corr-KIE"] == pytest.approx(reference["corr-KIE"], rel=row["error"] if not row["refined"] else REL)
+        assert row["refined"] == (not row["error"] <= 1e-3)
+
+    # hydrogen sites go straight to the exact path, without diagonalizing for normal modes
+    Kinisot.eigenvalue_memo.clear()
+    profiling.enable()
+    try:
+        rows = Kinisot.scan_isotope_effects(structures[:1], structures[1:], None, ['7', '7,8'], temperature=393.0,
+                                            freq_scale_factor=0.961, screen=1e-3)
+        phases = set(profiling.timers)
+    finally:
+        profiling.disable(); profiling.reset()
+    assert all(row["refined"] and np.isnan(row["error"]) for row in rows)
+    assert "eigh" not in phases and "eigvalsh" in phases and rows[0]["KIE"] == pytest.approx(exact[6]["KIE"], rel=REL)
+
+
+def test_shared_memory_structures_and_batch(tmp_path):
+    import json, os
+    import numpy as np
+    from multiprocessing import shared_memory
+    from kinisot import batch
+    from kinisot import shared
+    from kinisot.shared import SharedStructures, attach, detach
+    from kinisot.Hess_to_Freq import Structure
+    gs = datapath('gaussian/claisen_gs.out')
+    with SharedStructures() as published:
+        descriptors = published.publish({gs: Structure(gs)})
+        structure = attach(descriptors)[gs]
+        assert not structure.force_constants.flags.writeable
+        assert structure.key == Structure(gs).key
+        assert np.array_equal(Kinisot.calc_isotopologue_eigenvalues(structure, ['5'])[0],
+                              Kinisot.calc_isotopologue_eigenvalues(Structure(gs), ['5'])[0])
+        del structure
+        detach()
+        assert shared._attached == {}
+    # Windows removes a segment once no process has it open, but has no unlink
+    if os.name != "nt":
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=descriptors[gs]["segment"])
+
+    manifest = tmp_path / "jobs.jsonl"
+    lines = [{"rct": gs, "ts": datapath('gaussian/claisen_ts.out'), "iso": iso, "T": 393.0, "scale": 0.961} for iso in ["5", "4"]]
+    lines.append({"rct": gs, "ts": str(tmp_path / "missing.out"), "iso": "4"})
+    manifest.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+    results = list(batch.run_batch(batch.read_manifest(str(manifest)), 2, shared=True))
+    assert results[0]["KIE"] == pytest.approx(CASES[0][11], rel=REL)
+    assert results[1]["KIE"] == pytest.approx(CASES[1][11], rel=REL)
+    assert "missing.out" in results[2]["error"]
+
+
+def test_watch_recomputes_only_changed_complete_jobs(tmp_path):
+    import io, os, shutil
+    from kinisot import watch
+    from kinisot.batch import read_manifest
+    gs, ts = datapath('gaussian/claisen_gs.out'), datapath('gaussian/claisen_ts.out')
+    shutil.copy(gs, str(tmp_path / "gs.out"))
+    spec = tmp_path / "spec.csv"
+    spec.write_text("rct,ts,iso,T,scale\ngs.out,ts_*.out,5,393,0.961\n")
+    watcher = watch.Watcher(read_manifest(str(spec)))
+    out = io.StringIO()
+    watch.watch(watcher, out, polls=1)
+    assert out.getvalue() == ""
+
+    # a TS log still being written is skipped until it is complete
+    with open(ts) as f: text = f.read()
+    (tmp_path / "ts_1.out").write_text(text[:len(text) // 2])
+    assert watcher.poll() == []
+    (tmp_path / "ts_1.out").write_text(text)
+    results = watcher.poll()
+    assert len(results) == 1 and results[0]["KIE"] == pytest.approx(CASES[0][11], rel=REL)
+    assert watcher.poll() == []
+
+    # a new TS adds a job, and a changed input is recomputed without re-parsing the others
+    shutil.copy(ts, str(tmp_path / "ts_2.out"))
+    parsed = watcher.cache.load(str(tmp_path / "gs.out"))
+    assert [r["ts"] for r in watcher.poll()] == [[str(tmp_path / "ts_2.out")]]
+    assert watcher.cache.load(str(tmp_path / "gs.out")) is parsed
+    os.utime(str(tmp_path / "gs.out"), ns=(0, 0))
+    assert len(watcher.poll()) == 2